@@ -13,14 +13,19 @@ import os
 import sys
 import platform
 import threading
+import collections
 import multiprocessing
-from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import re
 import math
-import time as time_module
+import itertools
+import array
 import bisect
 import ctypes
-import tempfile
+import hashlib
+import struct
+import time
 
 
 # ============ 多语言配置 ============
@@ -125,24 +130,151 @@ LANGUAGES = {
 }
 
 
+# ============ Windows API ============
+
+# 指针宽度的 DWORD_PTR，用于亲和性掩码
+_DWORD_PTR = ctypes.c_uint64 if ctypes.sizeof(ctypes.c_void_p) == 8 else ctypes.c_uint32
+
+_K32 = None
+_USER32 = None
+
+
+def _configure_prototypes(kernel32, user32):
+    """配置本程序用到的 kernel32 / user32 函数原型"""
+    kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+    kernel32.GetCurrentProcess.argtypes = []
+    kernel32.GetProcessAffinityMask.restype = ctypes.c_int
+    kernel32.GetProcessAffinityMask.argtypes = [
+        ctypes.c_void_p, ctypes.POINTER(_DWORD_PTR), ctypes.POINTER(_DWORD_PTR)
+    ]
+    kernel32.SetProcessAffinityMask.restype = ctypes.c_int
+    kernel32.SetProcessAffinityMask.argtypes = [ctypes.c_void_p, _DWORD_PTR]
+    
+    if hasattr(kernel32, "SetProcessDefaultCpuSets"):
+        kernel32.SetProcessDefaultCpuSets.restype = ctypes.c_int
+        kernel32.SetProcessDefaultCpuSets.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_ulong), ctypes.c_ulong
+        ]
+    
+    user32.IsIconic.restype = ctypes.c_int
+    user32.IsIconic.argtypes = [ctypes.c_void_p]
+    user32.GetAncestor.restype = ctypes.c_void_p
+    user32.GetAncestor.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+    user32.GetDC.restype = ctypes.c_void_p
+    user32.GetDC.argtypes = [ctypes.c_void_p]
+    user32.ReleaseDC.restype = ctypes.c_int
+    user32.ReleaseDC.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+
+
+# 导入时加载一次，主进程与 worker 共用
+if platform.system() == "Windows":
+    try:
+        _K32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        _USER32 = ctypes.WinDLL('user32', use_last_error=True)
+        _configure_prototypes(_K32, _USER32)
+    except Exception as e:
+        print(f"[CPU] Windows API setup error: {e}")
+        _K32 = None
+        _USER32 = None
+
+
 # ============ 全局变量（用于多进程） ============
 
 _shared_affinity_mask = None
 _last_applied_mask = 0
 
+# Worker 进程中缓存的 SetProcessAffinityMask 函数与当前进程伪句柄
+_worker_set_affinity = None
+_worker_process = None
+_worker_dword_ptr = None
+
+# Worker 在进程池中的序号，用于把每个 worker 固定到目标掩码中不同的核心
+_worker_index = None
+
+# Worker 进程中挂载的共享内存块及其零拷贝视图
+_shared_blocks = []
+_shared_pts = None
+_shared_cum_bits = None
+
+
+def _create_shared_arrays(arrays):
+    """将多个 array.array 依次复制到同一块共享内存
+    
+    返回 (SharedMemory, 布局)，布局为 [(字节偏移, typecode, 长度), ...]，各段按 8 字节对齐。
+    """
+    layout = []
+    offset = 0
+    for arr in arrays:
+        layout.append((offset, arr.typecode, len(arr)))
+        offset += (len(arr) * arr.itemsize + 7) // 8 * 8
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(1, offset))
+    for arr, (start, _, length) in zip(arrays, layout):
+        shm.buf[start:start + length * arr.itemsize] = memoryview(arr).cast('B')
+    return shm, layout
+
 
-def _worker_init(shared_mask):
+def _attach_shared_arrays(name, layout):
+    """按名称挂载共享内存，返回 (SharedMemory, [各段的零拷贝视图])"""
+    shm = shared_memory.SharedMemory(name=name)
+    views = []
+    for start, typecode, length in layout:
+        itemsize = array.array(typecode).itemsize
+        views.append(shm.buf[start:start + length * itemsize].cast(typecode))
+    return shm, views
+
+
+def _worker_init(shared_mask, worker_counter=None, shm_name=None, shm_layout=None):
     """Worker 进程初始化函数"""
-    global _shared_affinity_mask
+    global _shared_affinity_mask, _shared_pts, _shared_cum_bits, _worker_index
     _shared_affinity_mask = shared_mask
+    
+    if worker_counter is not None:
+        with worker_counter.get_lock():
+            _worker_index = worker_counter.value
+            worker_counter.value += 1
+    
+    if shm_name is not None:
+        shm, (_shared_pts, _shared_cum_bits) = _attach_shared_arrays(shm_name, shm_layout)
+        _shared_blocks.append(shm)
+    
+    _init_worker_affinity_api()
     _apply_current_affinity(force=True)
 
 
+def _init_worker_affinity_api():
+    """在 worker 启动时取出一次 SetProcessAffinityMask 与进程伪句柄，之后直接复用"""
+    global _worker_set_affinity, _worker_process, _worker_dword_ptr
+    
+    if _K32 is None:
+        return
+    try:
+        _worker_dword_ptr = _DWORD_PTR
+        _worker_process = _K32.GetCurrentProcess()
+        _worker_set_affinity = _K32.SetProcessAffinityMask
+    except Exception as e:
+        print(f"[Worker PID {os.getpid()}] Affinity API error: {e}")
+        _worker_set_affinity = None
+
+
+def _single_core_mask(mask, index):
+    """取 mask 中第 index 个置位（按置位数取模）对应的单核掩码"""
+    bits = [bit for bit in range(mask.bit_length()) if mask >> bit & 1]
+    if not bits:
+        return mask
+    return 1 << bits[index % len(bits)]
+
+
 def _apply_current_affinity(force=False):
-    """应用当前的亲和性设置"""
-    global _shared_affinity_mask, _last_applied_mask
+    """应用当前的亲和性设置
     
-    if _shared_affinity_mask is None:
+    共享掩码只在用户切换最小化状态时由主进程改写；未变化时仅做一次整数比较，
+    不触发系统调用。worker 在每个分块开始前调用一次。
+    已分配序号的 worker 只绑定到掩码中的一个核心，避免在核心间迁移。
+    """
+    global _last_applied_mask
+    
+    if _shared_affinity_mask is None or _worker_set_affinity is None:
         return False
     
     mask = _shared_affinity_mask.value
@@ -152,52 +284,82 @@ def _apply_current_affinity(force=False):
     if not force and mask == _last_applied_mask:
         return True
     
-    if platform.system() == "Windows":
-        try:
-            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-            if ctypes.sizeof(ctypes.c_void_p) == 8:
-                DWORD_PTR = ctypes.c_uint64
-            else:
-                DWORD_PTR = ctypes.c_uint32
-            
-            kernel32.GetCurrentProcess.restype = ctypes.c_void_p
-            kernel32.SetProcessAffinityMask.restype = ctypes.c_int
-            kernel32.SetProcessAffinityMask.argtypes = [ctypes.c_void_p, DWORD_PTR]
-            
-            process = kernel32.GetCurrentProcess()
-            result = kernel32.SetProcessAffinityMask(process, DWORD_PTR(mask))
-            
-            if result:
-                old_mask = _last_applied_mask
-                _last_applied_mask = mask
-                if old_mask != mask:
-                    print(f"[Worker PID {os.getpid()}] Affinity: {hex(old_mask)} -> {hex(mask)}")
-                return True
-        except Exception as e:
-            print(f"[Worker PID {os.getpid()}] Affinity error: {e}")
-            return False
+    target_mask = mask if _worker_index is None else _single_core_mask(mask, _worker_index)
+    
+    try:
+        result = _worker_set_affinity(_worker_process, _worker_dword_ptr(target_mask))
+        if result:
+            old_mask = _last_applied_mask
+            _last_applied_mask = mask
+            if old_mask != mask:
+                print(f"[Worker PID {os.getpid()}] Affinity: {hex(old_mask)} -> {hex(target_mask)}")
+            return True
+    except Exception as e:
+        print(f"[Worker PID {os.getpid()}] Affinity error: {e}")
     return False
 
 
-def _calculate_chunk(frame_data, time_points, window_size):
-    """计算比特率（多进程）"""
-    _apply_current_affinity()
-    
-    results = []
-    total = len(time_points)
-    
-    for i, t in enumerate(time_points):
-        total_bits = sum(
-            size * 8 for pts, size in frame_data
-            if t <= pts < t + window_size
-        )
-        bitrate_kbps = total_bits / window_size / 1000
-        results.append((t + window_size / 2, bitrate_kbps))
-        
-        if i > 0 and i % 200 == 0:
-            _apply_current_affinity()
+# 每个时间步平均跨越的帧数超过该值时，改用 bisect 定位窗口边界：
+# 逐帧 while 推进是解释器循环，bisect 在 C 中完成，帧越密越划算
+_BISECT_DENSITY = 8
+
+
+def _bitrate_kernel(pts_arr, cum_bits, time_points, window_size, frame_start=0, frame_stop=None, use_bisect=False):
+    """滑动窗口比特率计算内核
+    
+    pts_arr 为按 pts 排序的帧时间，cum_bits 为对应的比特前缀和（长度 N+1）。
+    [frame_start, frame_stop) 为与这批时间点相交的帧区间，区间外的帧不会被访问。
+    use_bisect 为 True 时以 bisect 代替逐帧推进，适合帧密度高（窗口大、帧率高）的情况。
+    返回 (窗口中心时间, kbps) 两列 array('d')。
+    """
+    times = array.array('d')
+    kbps = array.array('d')
+    append_time = times.append
+    append_kbps = kbps.append
+    n = len(pts_arr) if frame_stop is None else frame_stop
+    lo = hi = frame_start
+    
+    # 窗口相关常量提到循环外：除法换成乘以倒数
+    half_window = window_size / 2
+    kbps_scale = 1.0 / (window_size * 1000)
+    
+    if use_bisect:
+        # lo/hi 同样单调不减，作为下一次查找的起点，查找范围随之收窄
+        bisect_left = bisect.bisect_left
+        for t in time_points:
+            lo = bisect_left(pts_arr, t, lo, n)
+            hi = bisect_left(pts_arr, t + window_size, hi, n)
+            append_time(t + half_window)
+            append_kbps((cum_bits[hi] - cum_bits[lo]) * kbps_scale)
+        return times, kbps
+    
+    for t in time_points:
+        # 双指针：time_points 单调递增，lo/hi 只会向前移动，总计 O(N+M)
+        while lo < n and pts_arr[lo] < t:
+            lo += 1
+        t_end = t + window_size
+        while hi < n and pts_arr[hi] < t_end:
+            hi += 1
+        total_bits = cum_bits[hi] - cum_bits[lo]
+        append_time(t + half_window)
+        append_kbps(total_bits * kbps_scale)
+    
+    return times, kbps
+
+
+def _calculate_chunk(time_range, frame_range, window_size):
+    """计算比特率（多进程）
     
-    return results
+    帧数据在 _worker_init 中从共享内存挂载。time_range 为 (首个时间点序号, 数量, 步长)，
+    frame_range 为该时间段（含窗口重叠）在共享数组中的 [start, stop) 偏移。
+    """
+    _apply_current_affinity()
+    first, count, step = time_range
+    time_points = map(step.__mul__, range(first, first + count))
+    frame_start, frame_stop = frame_range
+    use_bisect = frame_stop - frame_start > count * _BISECT_DENSITY
+    return _bitrate_kernel(_shared_pts, _shared_cum_bits, time_points, window_size,
+                           frame_start, frame_stop, use_bisect)
 
 
 # ============ CPU 亲和性管理器 ============
@@ -217,6 +379,12 @@ class CPUAffinityManager:
         self.detection_method = "none"
         self.efficiency_classes = {}
         
+        # CPU Set ID（GetSystemCpuSetInformation 返回），用于软性的核心偏好设置
+        self.efficiency_class_cpu_sets = {}
+        self.e_core_cpu_sets = []
+        self.p_core_cpu_sets = []
+        self.cpu_sets_supported = False
+        
         self.current_target_mask = 0
         self.current_target_type = "all"
         
@@ -237,12 +405,12 @@ class CPUAffinityManager:
             self.shared_mask = None
     
     def _setup_windows_types(self):
-        if platform.system() != "Windows":
+        self.DWORD_PTR = _DWORD_PTR
+        self._current_process = None
+        if _K32 is None:
             return
-        if ctypes.sizeof(ctypes.c_void_p) == 8:
-            self.DWORD_PTR = ctypes.c_uint64
-        else:
-            self.DWORD_PTR = ctypes.c_uint32
+        # 伪句柄，在进程生命周期内恒定
+        self._current_process = _K32.GetCurrentProcess()
     
     def _get_basic_core_count(self):
         try:
@@ -255,21 +423,11 @@ class CPUAffinityManager:
     
     def _detect_windows(self):
         try:
-            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-            
-            kernel32.GetCurrentProcess.restype = ctypes.c_void_p
-            kernel32.GetCurrentProcess.argtypes = []
-            kernel32.GetProcessAffinityMask.restype = ctypes.c_int
-            kernel32.GetProcessAffinityMask.argtypes = [
-                ctypes.c_void_p, ctypes.POINTER(self.DWORD_PTR), ctypes.POINTER(self.DWORD_PTR)
-            ]
-            
-            process = kernel32.GetCurrentProcess()
             process_mask = self.DWORD_PTR()
             system_mask = self.DWORD_PTR()
             
-            result = kernel32.GetProcessAffinityMask(
-                process, ctypes.byref(process_mask), ctypes.byref(system_mask)
+            result = _K32.GetProcessAffinityMask(
+                self._current_process, ctypes.byref(process_mask), ctypes.byref(system_mask)
             )
             
             if result:
@@ -285,6 +443,8 @@ class CPUAffinityManager:
             self._update_shared_mask(self.all_cores_mask)
             
             success = self._detect_via_cpuset_info()
+            if not success:
+                success = self._detect_via_logical_processor_info_ex()
             if not success:
                 success = self._detect_via_power_info()
             
@@ -300,7 +460,7 @@ class CPUAffinityManager:
     
     def _detect_via_cpuset_info(self):
         try:
-            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+            kernel32 = _K32
             try:
                 get_cpu_set_info = kernel32.GetSystemCpuSetInformation
             except AttributeError:
@@ -332,6 +492,7 @@ class CPUAffinityManager:
                 return False
             
             self.efficiency_classes = {}
+            self.efficiency_class_cpu_sets = {}
             offset = 0
             struct_size = ctypes.sizeof(SYSTEM_CPU_SET_INFORMATION)
             
@@ -343,6 +504,9 @@ class CPUAffinityManager:
                 lp_index = info.LogicalProcessorIndex
                 eff_class = info.EfficiencyClass
                 
+                # CPU Set ID 跨处理器组有效，不受 64 核掩码限制
+                self.efficiency_class_cpu_sets.setdefault(eff_class, []).append(info.Id)
+                
                 if lp_index < 64:
                     mask = 1 << lp_index
                     if eff_class not in self.efficiency_classes:
@@ -362,6 +526,14 @@ class CPUAffinityManager:
                 self.p_core_count = bin(self.p_cores_mask).count('1')
                 self.has_hybrid_arch = True
                 self.detection_method = "cpuset"
+                
+                self.e_core_cpu_sets = list(self.efficiency_class_cpu_sets.get(sorted_classes[0], []))
+                self.p_core_cpu_sets = []
+                for cls in sorted_classes[1:]:
+                    self.p_core_cpu_sets.extend(self.efficiency_class_cpu_sets.get(cls, []))
+                self.cpu_sets_supported = (
+                    bool(self.e_core_cpu_sets) and hasattr(kernel32, "SetProcessDefaultCpuSets")
+                )
                 return True
             
             return False
@@ -369,6 +541,89 @@ class CPUAffinityManager:
             print(f"[CPU] CpuSet error: {e}")
             return False
     
+    def _detect_via_logical_processor_info_ex(self):
+        """通过 GetLogicalProcessorInformationEx 读取每个物理核心的 EfficiencyClass"""
+        try:
+            kernel32 = _K32
+            try:
+                get_lpi_ex = kernel32.GetLogicalProcessorInformationEx
+            except AttributeError:
+                return False
+            
+            class GROUP_AFFINITY(ctypes.Structure):
+                _fields_ = [
+                    ("Mask", self.DWORD_PTR), ("Group", ctypes.c_ushort),
+                    ("Reserved", ctypes.c_ushort * 3),
+                ]
+            
+            class PROCESSOR_RELATIONSHIP(ctypes.Structure):
+                _fields_ = [
+                    ("Flags", ctypes.c_ubyte), ("EfficiencyClass", ctypes.c_ubyte),
+                    ("Reserved", ctypes.c_ubyte * 20), ("GroupCount", ctypes.c_ushort),
+                    ("GroupMask", GROUP_AFFINITY * 1),
+                ]
+            
+            class SYSTEM_LOGICAL_PROCESSOR_INFORMATION_EX(ctypes.Structure):
+                _fields_ = [
+                    ("Relationship", ctypes.c_int), ("Size", ctypes.c_ulong),
+                    ("Processor", PROCESSOR_RELATIONSHIP),
+                ]
+            
+            RelationProcessorCore = 0
+            get_lpi_ex.restype = ctypes.c_int
+            get_lpi_ex.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(ctypes.c_ulong)]
+            
+            required_size = ctypes.c_ulong(0)
+            get_lpi_ex(RelationProcessorCore, None, ctypes.byref(required_size))
+            
+            if required_size.value == 0:
+                return False
+            
+            buffer = (ctypes.c_ubyte * required_size.value)()
+            result = get_lpi_ex(
+                RelationProcessorCore, ctypes.cast(buffer, ctypes.c_void_p), ctypes.byref(required_size)
+            )
+            
+            if not result:
+                return False
+            
+            efficiency_classes = {}
+            offset = 0
+            struct_size = ctypes.sizeof(SYSTEM_LOGICAL_PROCESSOR_INFORMATION_EX)
+            
+            while offset + struct_size <= required_size.value:
+                info = SYSTEM_LOGICAL_PROCESSOR_INFORMATION_EX.from_buffer_copy(buffer, offset)
+                if info.Size == 0:
+                    break
+                
+                if info.Relationship == RelationProcessorCore:
+                    group_mask = info.Processor.GroupMask[0]
+                    # 与掩码路径一致，只处理第 0 组的 64 个逻辑处理器
+                    if group_mask.Group == 0:
+                        eff_class = info.Processor.EfficiencyClass
+                        efficiency_classes[eff_class] = efficiency_classes.get(eff_class, 0) | group_mask.Mask
+                
+                offset += info.Size
+            
+            if len(efficiency_classes) >= 2:
+                self.efficiency_classes = efficiency_classes
+                sorted_classes = sorted(efficiency_classes.keys())
+                self.e_cores_mask = efficiency_classes[sorted_classes[0]]
+                self.p_cores_mask = 0
+                for cls in sorted_classes[1:]:
+                    self.p_cores_mask |= efficiency_classes[cls]
+                
+                self.e_core_count = bin(self.e_cores_mask).count('1')
+                self.p_core_count = bin(self.p_cores_mask).count('1')
+                self.has_hybrid_arch = True
+                self.detection_method = "logical_processor_info_ex"
+                return True
+            
+            return False
+        except Exception as e:
+            print(f"[CPU] LogicalProcessorInformationEx error: {e}")
+            return False
+    
     def _detect_via_power_info(self):
         try:
             class PROCESSOR_POWER_INFORMATION(ctypes.Structure):
@@ -433,6 +688,8 @@ class CPUAffinityManager:
         self.current_target_mask = self.e_cores_mask
         self.current_target_type = "e_cores"
         self._update_shared_mask(self.e_cores_mask)
+        if self.cpu_sets_supported:
+            return self._set_default_cpu_sets(self.e_core_cpu_sets, "E-core")
         return self._set_affinity_mask(self.e_cores_mask, "E-core")
     
     def set_all_cores(self):
@@ -441,18 +698,40 @@ class CPUAffinityManager:
         self.current_target_mask = self.all_cores_mask
         self.current_target_type = "all"
         self._update_shared_mask(self.all_cores_mask)
+        if self.cpu_sets_supported:
+            return self._set_default_cpu_sets(None, "All")
         return self._set_affinity_mask(self.all_cores_mask, "All")
     
+    def _current_cpu_sets(self):
+        """当前目标对应的 CPU Set ID 列表；None 表示不限制"""
+        if self.current_target_type == "e_cores":
+            return self.e_core_cpu_sets
+        return None
+    
+    def _apply_cpu_sets(self, process, cpu_set_ids):
+        """对进程句柄调用 SetProcessDefaultCpuSets，cpu_set_ids 为 None 时清除偏好"""
+        set_cpu_sets = _K32.SetProcessDefaultCpuSets
+        if cpu_set_ids:
+            ids = (ctypes.c_ulong * len(cpu_set_ids))(*cpu_set_ids)
+            return set_cpu_sets(process, ids, len(cpu_set_ids)) != 0
+        return set_cpu_sets(process, None, 0) != 0
+    
+    def _set_default_cpu_sets(self, cpu_set_ids, name):
+        """CPU Set 只是调度偏好，系统在必要时仍可使用其他核心，且支持多处理器组"""
+        try:
+            if self._apply_cpu_sets(self._current_process, cpu_set_ids):
+                return True
+        except Exception as e:
+            print(f"[CPU] Set CPU sets error: {e}")
+        
+        # CPU Set 不可用时回退到硬亲和性掩码
+        self.cpu_sets_supported = False
+        mask = self.e_cores_mask if cpu_set_ids else self.all_cores_mask
+        return self._set_affinity_mask(mask, name)
+    
     def _set_affinity_mask(self, mask, name):
         try:
-            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-            kernel32.GetCurrentProcess.restype = ctypes.c_void_p
-            kernel32.GetCurrentProcess.argtypes = []
-            kernel32.SetProcessAffinityMask.restype = ctypes.c_int
-            kernel32.SetProcessAffinityMask.argtypes = [ctypes.c_void_p, self.DWORD_PTR]
-            
-            process = kernel32.GetCurrentProcess()
-            result = kernel32.SetProcessAffinityMask(process, self.DWORD_PTR(mask))
+            result = _K32.SetProcessAffinityMask(self._current_process, self.DWORD_PTR(mask))
             
             if result == 0:
                 return False
@@ -465,12 +744,15 @@ class CPUAffinityManager:
         if platform.system() != "Windows" or self.current_target_mask == 0:
             return False
         try:
-            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
-            kernel32.SetProcessAffinityMask.restype = ctypes.c_int
-            kernel32.SetProcessAffinityMask.argtypes = [ctypes.c_void_p, self.DWORD_PTR]
-            
             handle = ctypes.c_void_p(int(process._handle))
-            result = kernel32.SetProcessAffinityMask(handle, self.DWORD_PTR(self.current_target_mask))
+            
+            if self.cpu_sets_supported:
+                cpu_set_ids = self._current_cpu_sets()
+                if cpu_set_ids is None:
+                    return True
+                return self._apply_cpu_sets(handle, cpu_set_ids)
+            
+            result = _K32.SetProcessAffinityMask(handle, self.DWORD_PTR(self.current_target_mask))
             return result != 0
         except Exception as e:
             print(f"[CPU] Subprocess affinity error: {e}")
@@ -485,6 +767,298 @@ class CPUAffinityManager:
         return lang_dict["cpu_cores"].format(count=self.total_cores)
 
 
+# ============ 预览帧流 ============
+
+class LRUImageCache(collections.OrderedDict):
+    """容量受限的 LRU 映射：读取时移到队尾，写入超出容量时淘汰最久未用的项
+    
+    预览缓存中的值为 PPM 数据（320x180 约 170KB），显示时才解码到共享的 PhotoImage。
+    """
+    
+    def __init__(self, max_size=128):
+        super().__init__()
+        self.max_size = max_size
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+def _preview_scale_filter(preview_size):
+    """缩放并居中补黑边到预览尺寸的滤镜"""
+    w, h = preview_size
+    return f'scale={w}:{h}:force_original_aspect_ratio=decrease,pad={w}:{h}:(ow-iw)/2:(oh-ih)/2:black'
+
+
+def _preview_popen_kwargs():
+    kwargs = {"stdout": subprocess.PIPE, "stderr": subprocess.DEVNULL}
+    if platform.system() == "Windows":
+        kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+    return kwargs
+
+
+def _read_ppm_frame(stream):
+    """从管道读取一帧二进制 PPM（P6），流结束时返回 None"""
+    header = []
+    tokens = []
+    while len(tokens) < 4:
+        line = stream.readline()
+        if not line:
+            return None
+        header.append(line)
+        tokens.extend(line.split())
+    
+    magic, width, height, maxval = tokens[:4]
+    if magic != b'P6':
+        return None
+    
+    sample_bytes = 1 if int(maxval) < 256 else 2
+    size = int(width) * int(height) * 3 * sample_bytes
+    data = stream.read(size)
+    if len(data) < size:
+        return None
+    return b''.join(header) + data
+
+
+class PreviewFrameStream:
+    """常驻 ffmpeg 预览帧流
+    
+    从起始位置以 fps=2 连续解码输出 PPM 帧，按半秒刻度存放，
+    悬停时只需查表；领先悬停位置 read_ahead 帧后暂停读取，由管道背压让 ffmpeg 等待。
+    """
+    
+    def __init__(self, ffmpeg_path, video_path, preview_size, read_ahead=60, max_frames=240):
+        self.ffmpeg_path = ffmpeg_path
+        self.video_path = video_path
+        self.preview_size = preview_size
+        self.read_ahead = read_ahead
+        self.max_frames = max_frames
+        
+        self.frames = collections.OrderedDict()
+        self.condition = threading.Condition()
+        self.process = None
+        self.start_key = None
+        self.next_key = None
+        self.wanted_key = None
+        self.finished = True
+    
+    def start(self, key):
+        self.stop()
+        
+        cmd = [
+            self.ffmpeg_path,
+            '-ss', str(key / 2),
+            '-i', self.video_path,
+            '-an', '-sn',
+            '-vf', 'fps=2,' + _preview_scale_filter(self.preview_size),
+            '-f', 'image2pipe',
+            '-vcodec', 'ppm',
+            '-'
+        ]
+        
+        try:
+            process = subprocess.Popen(cmd, **_preview_popen_kwargs())
+        except Exception as e:
+            print(f"[Preview] Stream start error: {e}")
+            return False
+        
+        with self.condition:
+            self.process = process
+            self.start_key = key
+            self.next_key = key
+            self.wanted_key = key
+            self.finished = False
+        
+        thread = threading.Thread(target=self._read_frames, args=(process, key), daemon=True)
+        thread.start()
+        return True
+    
+    def stop(self):
+        with self.condition:
+            process = self.process
+            self.process = None
+            self.finished = True
+            self.condition.notify_all()
+        
+        if process is not None:
+            try:
+                process.kill()
+            except:
+                pass
+    
+    def lookup(self, key):
+        """返回 (PPM 数据, 是否仍会由当前流产出)"""
+        with self.condition:
+            data = self.frames.get(key)
+            if data is not None:
+                self.frames.move_to_end(key)
+            
+            pending = (data is None and not self.finished and
+                       self.start_key <= key < self.next_key + self.read_ahead)
+            
+            if not self.finished and key >= self.start_key and key > self.wanted_key:
+                self.wanted_key = key
+                self.condition.notify_all()
+            
+            return data, pending
+    
+    def _read_frames(self, process, key):
+        stdout = process.stdout
+        try:
+            while True:
+                with self.condition:
+                    while self.process is process and key >= self.wanted_key + self.read_ahead:
+                        self.condition.wait()
+                    if self.process is not process:
+                        return
+                
+                frame = _read_ppm_frame(stdout)
+                if frame is None:
+                    return
+                
+                with self.condition:
+                    if self.process is not process:
+                        return
+                    self.frames[key] = frame
+                    self.frames.move_to_end(key)
+                    while len(self.frames) > self.max_frames:
+                        self.frames.popitem(last=False)
+                    key += 1
+                    self.next_key = key
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self.condition:
+                if self.process is process:
+                    self.finished = True
+            try:
+                stdout.close()
+            except:
+                pass
+
+
+class PreviewWorker:
+    """单帧抽取线程池
+    
+    常驻流覆盖不到的刻度（向后回退等）在这里以 PPM 管道单次抽帧。
+    同一刻度同时只有一个任务在途；取帧时顺带预取相邻刻度，在途任务总数不超过 max_in_flight。
+    前方 keyframe_snap 秒内有关键帧时直接取该关键帧，省去从关键帧解码到目标时间的开销。
+    """
+    
+    def __init__(self, ffmpeg_path, video_path, preview_size, on_frame, max_workers=2, max_in_flight=4,
+                 keyframe_times=None, keyframe_snap=1.0):
+        self.ffmpeg_path = ffmpeg_path
+        self.video_path = video_path
+        self.preview_size = preview_size
+        self.on_frame = on_frame
+        self.max_in_flight = max_in_flight
+        self.keyframe_times = keyframe_times if keyframe_times is not None else array.array('d')
+        self.keyframe_snap = keyframe_snap
+        
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.in_flight = set()
+        self.lock = threading.Lock()
+    
+    def request(self, key, prefetch=()):
+        """提交 key 的抽帧任务，并在在途上限内预取 prefetch 中的刻度"""
+        with self.lock:
+            self._submit(key)
+            for neighbor in prefetch:
+                if len(self.in_flight) >= self.max_in_flight:
+                    break
+                self._submit(neighbor)
+    
+    def _submit(self, key):
+        if key < 0 or key in self.in_flight:
+            return
+        self.in_flight.add(key)
+        try:
+            self.executor.submit(self._extract, key)
+        except RuntimeError:
+            # 已关闭
+            self.in_flight.discard(key)
+    
+    def _snaps_to_keyframe(self, time_sec):
+        """time_sec 之前 keyframe_snap 秒内是否有关键帧"""
+        keyframes = self.keyframe_times
+        i = bisect.bisect_right(keyframes, time_sec) - 1
+        return i >= 0 and time_sec - keyframes[i] <= self.keyframe_snap
+    
+    def _extract(self, key):
+        time_sec = key / 2
+        # 索引确认前方不远处有关键帧时关闭精确 seek，ffmpeg 直接输出该关键帧；
+        # 否则保持精确 seek，避免退回到很远的关键帧
+        seek_args = ['-ss', str(time_sec)]
+        if self._snaps_to_keyframe(time_sec):
+            seek_args.insert(0, '-noaccurate_seek')
+        
+        cmd = [
+            self.ffmpeg_path,
+            *seek_args,
+            '-i', self.video_path,
+            '-an', '-sn',
+            '-vframes', '1',
+            '-vf', _preview_scale_filter(self.preview_size),
+            '-f', 'image2pipe',
+            '-vcodec', 'ppm',
+            '-'
+        ]
+        
+        data = None
+        try:
+            result = subprocess.run(cmd, **_preview_popen_kwargs(), timeout=5)
+            if result.returncode == 0 and result.stdout:
+                data = result.stdout
+        except Exception as e:
+            print(f"[Preview] Extract error: {e}")
+        finally:
+            with self.lock:
+                self.in_flight.discard(key)
+        
+        if data is not None:
+            self.on_frame(self, key, data)
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ============ 包数据磁盘缓存 ============
+
+_PACKET_CACHE_MAGIC = b"BRVPKT2\0"
+_PACKET_CACHE_MAX_FILES = 32
+_PACKET_CACHE_HASH_BYTES = 1 << 20
+
+# 长视频分段并发运行 ffprobe：每段至少 5 分钟，最多 4 段；
+# 段尾多读的余量用于覆盖 B 帧重排导致的 pts 乱序
+_PROBE_SEGMENT_MIN_DURATION = 300.0
+_PROBE_MAX_SEGMENTS = 4
+_PROBE_SEGMENT_MARGIN = 5.0
+
+# 区间统计的分块大小：每块预先算好最小/最大值，查询时整块查表，首尾零头直接切片
+_STATS_BLOCK = 256
+
+
+def _user_cache_dir():
+    """返回用户缓存目录（Windows 为 LOCALAPPDATA，其余平台遵循 XDG）"""
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "bitrate_viewer")
+
+
 # ============ 主应用程序 ============
 
 class BitrateAnalyzer:
@@ -498,6 +1072,7 @@ class BitrateAnalyzer:
         self.root.title(self.lang["window_title"])
         
         self.dpi_scale = self.get_dpi_scale()
+        self._compute_scaled_sizes()
         
         base_width, base_height = 1100, 850
         self.root.geometry(f"{int(base_width * self.dpi_scale)}x{int(base_height * self.dpi_scale)}")
@@ -506,19 +1081,37 @@ class BitrateAnalyzer:
         self.ffmpeg_path = None
         self.ffprobe_path = None
         self.video_path = None
-        self.bitrate_data = []
-        self.time_index = []
+        # 结构数组（SoA）：时间与比特率各为一列连续 double
+        self.bitrate_times = array.array('d')
+        self.bitrate_kbps = array.array('d')
+        # 比特率前缀和（长度 N+1），bitrate_cumsum[j] - bitrate_cumsum[i] 为 [i, j) 区间之和；
+        # 以及每 _STATS_BLOCK 个点的最小/最大值
+        self.bitrate_cumsum = array.array('d', [0.0])
+        self.bitrate_block_min = array.array('d')
+        self.bitrate_block_max = array.array('d')
+        self.bitrate_pyramid = []
         self.analyzing = False
         self.chart_info = None
-        self.crosshair_items = []
+        self.chart_items = {}
+        # 文本图元上次设置的 (x, y, text)：改坐标或文本都会让 Tk 重新排版，未变化时跳过
+        self.chart_text_state = {}
+        # 各刻度标签池当前显示中的图元数
+        self.label_pool_shown = {}
+        self.crosshair_visible = False
+        # 比特率文本缓存：刻度值与悬停采样点在重绘、移动间反复出现
+        self.bitrate_label_cache = {}
+        self.tick_label_cache = {}
         
         self.video_fps = 25.0
         
-        self.current_visible_data = []
-        self.current_visible_points = []
+        # 当前绘制的采样点（按 x 递增），供十字线查找
+        self.visible_xs = []
+        self.visible_ys = []
+        self.visible_bounds = (0, 0)
+        self.visible_times = array.array('d')
+        self.visible_kbps = array.array('d')
         
-        self.last_mouse_update = 0
-        self.mouse_throttle_ms = 25
+        self.last_mouse_xy = None
         self.pending_mouse_update = None
         
         self.view_start = 0.0
@@ -529,25 +1122,62 @@ class BitrateAnalyzer:
         self.thumbnail_drag_mode = None
         self.thumbnail_drag_start_x = 0
         self.thumbnail_drag_start_view = (0, 1)
-        self.thumbnail_data = []
+        # (列数, 数据列, (列号, 最小值, 最大值))：缩略图逐像素列的比特率范围
+        self.thumbnail_columns = None
         self.thumbnail_info = None
+        # 缩略图的常驻图元（边框、填充、曲线）与选区图元，首次绘制时创建
+        self.thumbnail_items = {}
+        self.thumbnail_image = None
+        # (宽, 高, 数据列)：缩略图图像当前显示的内容，尺寸与数据都未变时不重新光栅化
+        self.thumbnail_image_key = None
         self.selection_items = {}
+        # 上次设置选区坐标时的 (x1, x2, thumbnail_info)
+        self.selection_view = None
         
         self.cpu_manager = CPUAffinityManager()
+        # (缓存键, pts_arr, sizes, keyframe_times)：切换采样窗口时直接复用
+        self.packet_cache = None
+        # 关键帧 pts（升序），预览抽帧据此决定是否直接取关键帧
+        self.keyframe_times = array.array('d')
+        self.video_stream_index = None
+        self.parallel_min_work = 5_000_000
         self.is_minimized = False
+        self.pending_state_check = None
         self.use_e_cores_when_minimized = True
         
-        self.pending_chart_draw = None
-        self.pending_thumbnail_draw = None
+        # 主图固定帧率渲染：事件处理只置脏标记，16ms 一帧的渲染循环统一重绘，空闲时循环自行停止
+        self.chart_dirty = False
+        self.pending_render_tick = None
+        # 两块画布的尺寸变化共用一个定时器；记录上次绘制时的尺寸，未变化的画布不重绘
+        self.pending_resize_draw = None
+        self.chart_drawn_size = None
+        self.thumbnail_drawn_size = None
+        
+        # 进度更新可能来自多个工作线程：只保留最新一条，主线程最多每 50ms 刷新一次
+        self.progress_lock = threading.Lock()
+        self.pending_progress = None
+        self.progress_scheduled = False
+        self.progress_interval = 0.05
+        self.last_progress_ts = 0.0
         
         self.show_preview = False
         self.preview_window = None
         self.preview_label = None
         self.preview_image = None
+        self.preview_data = None
         self.preview_time_label = None
         self.last_preview_time = -999
-        self.preview_cache = {}
+        # 以半秒刻度（int(time*2)）为键的 LRU 缓存，限制缓存的 PPM 帧数据量
+        self.preview_cache = LRUImageCache(max_size=128)
         self.preview_size = (320, 180)
+        self.preview_stream = None
+        self.preview_worker = None
+        self.preview_request = None
+        self.preview_throttle_ms = 50
+        self.preview_stream_poll_ms = 40
+        self.pending_preview_args = None
+        self.preview_backtrack_keys = 10
+        self.preview_keyframe_snap = 1.0
         self.preview_pending = None
         
         self.setup_fonts()
@@ -562,6 +1192,25 @@ class BitrateAnalyzer:
             text = text.format(**kwargs)
         return text
     
+    def _compute_scaled_sizes(self):
+        """按 DPI 换算绘图用的像素尺寸；dpi_scale 变化时需重新调用"""
+        scale = self.dpi_scale
+        self.chart_margin = {
+            "left": int(85 * scale), "right": int(30 * scale),
+            "top": int(45 * scale), "bottom": int(55 * scale)
+        }
+        # 主图文本相对绘图区的偏移
+        self.chart_text_offsets = {
+            "x_label": int(12 * scale), "avg_label": int(8 * scale), "title": int(25 * scale),
+            "x_title": int(10 * scale), "y_title": int(15 * scale)
+        }
+        self.thumbnail_margin = {"left": int(10 * scale), "right": int(10 * scale),
+                                 "top": int(10 * scale), "bottom": int(10 * scale)}
+        self.crosshair_r = int(5 * scale)
+        # 缩略图选区手柄的半宽与拖动命中范围
+        self.handle_half_w = int(6 * scale) // 2
+        self.handle_hit_w = int(10 * scale)
+    
     def get_dpi_scale(self):
         try:
             if platform.system() == "Windows":
@@ -572,11 +1221,11 @@ class BitrateAnalyzer:
                     try:
                         windll.shcore.SetProcessDpiAwareness(1)
                     except:
-                        windll.user32.SetProcessDPIAware()
+                        _USER32.SetProcessDPIAware()
                 
-                hdc = windll.user32.GetDC(0)
-                dpi = windll.gdi32.GetDeviceCaps(hdc, 88)
-                windll.user32.ReleaseDC(0, hdc)
+                hdc = _USER32.GetDC(None)
+                dpi = windll.gdi32.GetDeviceCaps(ctypes.c_void_p(hdc), 88)
+                _USER32.ReleaseDC(None, hdc)
                 return dpi / 96.0
         except:
             pass
@@ -737,7 +1386,8 @@ class BitrateAnalyzer:
         )
         self.preview_check.pack(side=tk.LEFT, padx=(20, 0))
         
-        self.zoom_label = ttk.Label(zoom_frame, text=f"{self.get_text('display')} 100.0%", font=self.fonts["normal"])
+        self.zoom_label_text = f"{self.get_text('display')} 100.0%"
+        self.zoom_label = ttk.Label(zoom_frame, text=self.zoom_label_text, font=self.fonts["normal"])
         self.zoom_label.pack(side=tk.RIGHT)
         
         # 视频信息区
@@ -807,46 +1457,35 @@ class BitrateAnalyzer:
         
         self.update_zoom_label()
         
-        # 重绘图表以更新标签
-        if self.bitrate_data:
-            self.draw_chart()
-        else:
-            self.canvas.delete("all")
-            width = self.canvas.winfo_width()
-            height = self.canvas.winfo_height()
-            if width > 100 and height > 100:
-                self.canvas.create_text(
-                    width / 2, height / 2,
-                    text=self.get_text("select_video_hint"),
-                    font=self.fonts["title"], fill="#999"
-                )
+        # 重绘图表以更新标签（无数据时显示提示文字）
+        self.draw_chart()
         
         # 更新视频信息
         if hasattr(self, 'video_duration') and hasattr(self, 'last_video_info'):
             self.update_video_info(self.video_duration, self.last_video_info)
     
     def setup_window_state_handler(self):
+        # 仅由 <Map>/<Unmap> 事件驱动，不再定时轮询窗口状态
         if platform.system() == "Windows":
             self.root.bind("<Unmap>", self._on_window_unmap)
             self.root.bind("<Map>", self._on_window_map)
-            self._start_state_polling()
     
     def _on_window_unmap(self, event):
         if event.widget == self.root:
-            self.root.after(100, self._check_minimized_state)
+            self._schedule_state_check()
     
     def _on_window_map(self, event):
         if event.widget == self.root:
-            self.root.after(100, self._check_minimized_state)
+            self._schedule_state_check()
     
-    def _start_state_polling(self):
-        self._poll_window_state()
-    
-    def _poll_window_state(self):
-        self._check_minimized_state()
-        self.root.after(500, self._poll_window_state)
+    def _schedule_state_check(self):
+        # 状态切换后稍等窗口管理器完成，再做一次性检查
+        if self.pending_state_check:
+            self.root.after_cancel(self.pending_state_check)
+        self.pending_state_check = self.root.after(100, self._check_minimized_state)
     
     def _check_minimized_state(self):
+        self.pending_state_check = None
         try:
             is_minimized = False
             try:
@@ -857,10 +1496,9 @@ class BitrateAnalyzer:
             
             if not is_minimized and platform.system() == "Windows":
                 try:
-                    user32 = ctypes.windll.user32
                     hwnd = self._get_window_handle()
                     if hwnd:
-                        is_minimized = user32.IsIconic(hwnd) != 0
+                        is_minimized = _USER32.IsIconic(hwnd) != 0
                 except:
                     pass
             
@@ -878,9 +1516,8 @@ class BitrateAnalyzer:
         except:
             pass
         try:
-            user32 = ctypes.windll.user32
             widget_hwnd = self.root.winfo_id()
-            hwnd = user32.GetAncestor(widget_hwnd, 2)
+            hwnd = _USER32.GetAncestor(widget_hwnd, 2)
             return hwnd if hwnd else widget_hwnd
         except:
             pass
@@ -922,6 +1559,7 @@ class BitrateAnalyzer:
         self.show_preview = self.preview_var.get()
         if not self.show_preview:
             self.hide_preview()
+            self._stop_preview_sources()
     
     def create_preview_window(self):
         if self.preview_window is None:
@@ -937,7 +1575,10 @@ class BitrateAnalyzer:
             inner_frame = tk.Frame(outer_frame, bg="#f5f5f5")
             inner_frame.pack(fill=tk.BOTH, expand=True)
             
-            self.preview_label = tk.Label(inner_frame, bg="#000000")
+            # 预览始终复用同一个 PhotoImage，缓存中只保存 PPM 数据
+            self.preview_image = tk.PhotoImage(width=self.preview_size[0], height=self.preview_size[1])
+            self.preview_data = None
+            self.preview_label = tk.Label(inner_frame, bg="#000000", image=self.preview_image)
             self.preview_label.pack(padx=2, pady=(2, 0))
             
             self.preview_time_label = tk.Label(
@@ -951,9 +1592,11 @@ class BitrateAnalyzer:
     def hide_preview(self):
         if self.preview_window:
             self.preview_window.withdraw()
+        self.preview_request = None
         if self.preview_pending:
             self.root.after_cancel(self.preview_pending)
             self.preview_pending = None
+        self.pending_preview_args = None
     
     def request_preview(self, time_sec, mouse_x, mouse_y):
         if not self.show_preview or not self.video_path or not self.ffmpeg_path:
@@ -967,85 +1610,108 @@ class BitrateAnalyzer:
         
         self.last_preview_time = rounded_time
         
-        if self.preview_pending:
-            self.root.after_cancel(self.preview_pending)
-        
-        self.preview_pending = self.root.after(
-            100,
-            lambda: self._fetch_preview_async(rounded_time, mouse_x, mouse_y)
-        )
+        # 节流：只记录最新的请求，定时器未挂起时才调度一次，不为每个事件创建闭包
+        self.pending_preview_args = (rounded_time, mouse_x, mouse_y)
+        if self.preview_pending is None:
+            self.preview_pending = self.root.after(self.preview_throttle_ms, self._flush_preview_request)
+    
+    def _flush_preview_request(self):
+        self.preview_pending = None
+        args = self.pending_preview_args
+        self.pending_preview_args = None
+        if args is None:
+            # 等待常驻流产出帧的轮询
+            args = self.preview_request
+        if args is not None:
+            self._fetch_preview_async(*args)
+    
+    @staticmethod
+    def _preview_key(time_sec):
+        return int(round(time_sec * 2))
     
     def _fetch_preview_async(self, time_sec, mouse_x, mouse_y):
-        if time_sec in self.preview_cache:
-            self._show_preview(self.preview_cache[time_sec], time_sec, mouse_x, mouse_y)
+        self.preview_request = (time_sec, mouse_x, mouse_y)
+        key = self._preview_key(time_sec)
+        data = self.preview_cache.get(key)
+        if data is not None:
+            self._show_preview(data, time_sec, mouse_x, mouse_y)
             return
         
-        thread = threading.Thread(
-            target=self._fetch_preview_thread,
-            args=(time_sec, mouse_x, mouse_y),
-            daemon=True
-        )
-        thread.start()
-    
-    def _fetch_preview_thread(self, time_sec, mouse_x, mouse_y):
-        tmp_path = None
-        try:
-            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                tmp_path = tmp.name
-            
-            cmd = [
-                self.ffmpeg_path,
-                '-ss', str(time_sec),
-                '-i', self.video_path,
-                '-vframes', '1',
-                '-vf', f'scale={self.preview_size[0]}:{self.preview_size[1]}:force_original_aspect_ratio=decrease,pad={self.preview_size[0]}:{self.preview_size[1]}:(ow-iw)/2:(oh-ih)/2:black',
-                '-y',
-                tmp_path
-            ]
-            
-            kwargs = {"stdout": subprocess.PIPE, "stderr": subprocess.PIPE}
-            if platform.system() == "Windows":
-                kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
-            
-            result = subprocess.run(cmd, **kwargs, timeout=5)
-            
-            if result.returncode == 0 and os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0:
-                self.root.after(0, lambda: self._load_and_show_preview(tmp_path, time_sec, mouse_x, mouse_y))
-            else:
-                if tmp_path and os.path.exists(tmp_path):
-                    try:
-                        os.unlink(tmp_path)
-                    except:
-                        pass
-                    
-        except Exception as e:
-            if tmp_path and os.path.exists(tmp_path):
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
-    
-    def _load_and_show_preview(self, tmp_path, time_sec, mouse_x, mouse_y):
-        try:
-            image = tk.PhotoImage(file=tmp_path)
-            self.preview_cache[time_sec] = image
-            self._show_preview(image, time_sec, mouse_x, mouse_y)
-        except Exception as e:
-            pass
-        finally:
-            try:
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-            except:
-                pass
+        stream = self._get_preview_stream()
+        data, pending = stream.lookup(key)
+        if data is not None:
+            self.preview_cache[key] = data
+            self._show_preview(data, time_sec, mouse_x, mouse_y)
+            return
+        
+        if not pending:
+            backtrack = None if stream.start_key is None else stream.start_key - key
+            if key != stream.start_key and not (backtrack and 0 < backtrack <= self.preview_backtrack_keys):
+                # 跳转超出当前流范围：在新位置重启常驻流
+                pending = stream.start(key)
+        
+        if pending:
+            self.preview_pending = self.root.after(self.preview_stream_poll_ms, self._flush_preview_request)
+            return
+        
+        # 稍向后回退或流无法产出该帧时，单次抽帧；回退方向的相邻刻度一并预取
+        prefetch = [k for k in (key - 1, key - 2) if k not in self.preview_cache]
+        self._get_preview_worker().request(key, prefetch)
+    
+    def _get_preview_stream(self):
+        stream = self.preview_stream
+        if stream is None or stream.video_path != self.video_path or stream.ffmpeg_path != self.ffmpeg_path:
+            if stream is not None:
+                stream.stop()
+            stream = PreviewFrameStream(self.ffmpeg_path, self.video_path, self.preview_size)
+            self.preview_stream = stream
+        return stream
+    
+    def _get_preview_worker(self):
+        worker = self.preview_worker
+        if (worker is None or worker.video_path != self.video_path or worker.ffmpeg_path != self.ffmpeg_path
+                or worker.keyframe_times is not self.keyframe_times):
+            if worker is not None:
+                worker.shutdown()
+            worker = PreviewWorker(self.ffmpeg_path, self.video_path, self.preview_size, self._on_worker_frame,
+                                   keyframe_times=self.keyframe_times, keyframe_snap=self.preview_keyframe_snap)
+            self.preview_worker = worker
+        return worker
+    
+    def _stop_preview_sources(self):
+        if self.preview_stream is not None:
+            self.preview_stream.stop()
+            self.preview_stream = None
+        if self.preview_worker is not None:
+            self.preview_worker.shutdown()
+            self.preview_worker = None
+    
+    def _on_worker_frame(self, worker, key, data):
+        # 在线程池中回调，转交主线程处理
+        self.root.after(0, lambda: self._store_worker_frame(worker, key, data))
+    
+    def _store_worker_frame(self, worker, key, data):
+        if worker is not self.preview_worker:
+            return
+        self.preview_cache[key] = data
+        
+        # 只显示仍是当前悬停位置的帧，预取帧只入缓存
+        request = self.preview_request
+        if request is not None and self._preview_key(request[0]) == key:
+            self._show_preview(data, *request)
     
-    def _show_preview(self, image, time_sec, mouse_x, mouse_y):
+    def _show_preview(self, data, time_sec, mouse_x, mouse_y):
+        """把 PPM 数据解码到唯一的预览 PhotoImage 中显示"""
         if not self.show_preview:
             return
         
         self.create_preview_window()
-        self.preview_image = image
-        self.preview_label.config(image=image)
+        if data is not self.preview_data:
+            try:
+                self.preview_image.configure(data=data)
+            except tk.TclError:
+                return
+            self.preview_data = data
         self.preview_time_label.config(text=self.format_time_with_frames(time_sec))
         
         self._update_preview_position(mouse_x, mouse_y)
@@ -1053,7 +1719,7 @@ class BitrateAnalyzer:
     
     def _update_preview_position(self, mouse_x, mouse_y):
         if not self.preview_window or not self.preview_window.winfo_viewable():
-            if self.preview_window and self.preview_image:
+            if self.preview_window and self.preview_data is not None:
                 self.preview_window.deiconify()
             else:
                 return
@@ -1082,7 +1748,8 @@ class BitrateAnalyzer:
         self.preview_window.geometry(f"+{x}+{y}")
     
     def clear_preview_cache(self):
-        self.preview_cache = {}
+        self.preview_cache.clear()
+        self._stop_preview_sources()
         self.last_preview_time = -999
     
     # ============ FFmpeg 相关 ============
@@ -1176,6 +1843,29 @@ class BitrateAnalyzer:
             return f"{hours}:{minutes:02d}:{secs:02d}"
         return f"{minutes}:{secs:02d}"
     
+    def format_bitrate(self, kbps):
+        """格式化比特率（两位小数的 Mbps 或整数 Kbps），结果按数值缓存"""
+        label = self.bitrate_label_cache.get(kbps)
+        if label is None:
+            if len(self.bitrate_label_cache) >= 4096:
+                self.bitrate_label_cache.clear()
+            label = f"{kbps/1000:.2f} Mbps" if kbps >= 1000 else f"{kbps:.0f} Kbps"
+            self.bitrate_label_cache[kbps] = label
+        return label
+    
+    def format_tick_bitrate(self, kbps):
+        """格式化纵轴刻度（整数或一位小数的 Mbps、整数 Kbps），刻度值在缩放间大量重复，同样缓存"""
+        label = self.tick_label_cache.get(kbps)
+        if label is None:
+            if len(self.tick_label_cache) >= 4096:
+                self.tick_label_cache.clear()
+            if kbps >= 1000:
+                label = f"{kbps/1000:.0f} Mbps" if kbps % 1000 == 0 else f"{kbps/1000:.1f} Mbps"
+            else:
+                label = f"{kbps:.0f} Kbps"
+            self.tick_label_cache[kbps] = label
+        return label
+    
     def on_window_changed(self, event=None):
         if self.video_path and not self.analyzing:
             self.start_analysis()
@@ -1207,16 +1897,22 @@ class BitrateAnalyzer:
         self.analyzing = True
         self.select_btn.config(state='disabled')
         self.window_combo.config(state='disabled')
-        self.bitrate_data = []
-        self.time_index = []
-        self.thumbnail_data = []
-        self.current_visible_data = []
-        self.current_visible_points = []
+        self.bitrate_times = array.array('d')
+        self.bitrate_kbps = array.array('d')
+        self.bitrate_cumsum = array.array('d', [0.0])
+        self.bitrate_block_min = array.array('d')
+        self.bitrate_block_max = array.array('d')
+        self.keyframe_times = array.array('d')
+        self.bitrate_label_cache.clear()
+        self.tick_label_cache.clear()
+        self.bitrate_pyramid = []
+        self.thumbnail_columns = None
+        self.thumbnail_image_key = None
+        self.visible_xs = []
         self.view_start = 0.0
         self.view_end = 1.0
-        self.selection_items = {}
-        self.canvas.delete("all")
-        self.thumbnail_canvas.delete("all")
+        self._hide_chart_items()
+        self._hide_thumbnail_items()
         self.video_info_label.config(text="")
         self.cursor_info_label.config(text="")
         self.update_zoom_label()
@@ -1258,12 +1954,13 @@ class BitrateAnalyzer:
             self.update_progress(5, f"{self.get_text('video_duration')}: {self.format_time_short(duration)}, FPS: {self.video_fps:.2f}")
             self.update_progress(8, self.get_text("reading_frames"))
             
-            packets = self.get_packets_data(duration)
-            if not packets:
+            frames = self.get_packets_data(duration)
+            if not frames:
                 self.update_progress(0, self.get_text("error_frames"))
                 return
             
-            self.update_progress(80, self.get_text("packets_read", count=len(packets)))
+            pts_arr, sizes = frames
+            self.update_progress(80, self.get_text("packets_read", count=len(pts_arr)))
             
             window_size = float(self.window_var.get())
             
@@ -1272,11 +1969,13 @@ class BitrateAnalyzer:
             else:
                 num_workers = self.cpu_manager.total_cores
             
-            self.bitrate_data = self.calculate_bitrate_parallel(packets, duration, window_size, num_workers)
-            self.time_index = [d[0] for d in self.bitrate_data]
-            self.prepare_thumbnail_data()
+            times, kbps = self.calculate_bitrate_parallel(pts_arr, sizes, duration, window_size, num_workers)
+            # 区间统计索引先于数据列赋值，重绘时两者总是匹配
+            self.bitrate_cumsum, self.bitrate_block_min, self.bitrate_block_max = self._build_stats_index(kbps)
+            self.bitrate_times, self.bitrate_kbps = times, kbps
+            self.build_bitrate_pyramid()
             
-            self.update_progress(100, self.get_text("done", count=len(self.bitrate_data)))
+            self.update_progress(100, self.get_text("done", count=len(self.bitrate_kbps)))
             
             self.root.after(0, self.draw_chart)
             self.root.after(0, self.draw_thumbnail)
@@ -1294,64 +1993,155 @@ class BitrateAnalyzer:
             self.root.after(0, lambda: self.select_btn.config(state='normal'))
             self.root.after(0, lambda: self.window_combo.config(state='readonly'))
     
-    def prepare_thumbnail_data(self):
-        max_thumb_points = 400
-        
-        if len(self.bitrate_data) <= max_thumb_points:
-            self.thumbnail_data = self.bitrate_data[:]
-        else:
-            step = len(self.bitrate_data) / max_thumb_points
-            self.thumbnail_data = [self.bitrate_data[0]]
-            
-            for i in range(1, max_thumb_points - 1):
-                bucket_start = int(i * step)
-                bucket_end = int((i + 1) * step)
-                bucket = self.bitrate_data[bucket_start:bucket_end]
-                if bucket:
-                    max_point = max(bucket, key=lambda x: x[1])
-                    self.thumbnail_data.append(max_point)
-            
-            self.thumbnail_data.append(self.bitrate_data[-1])
-            self.thumbnail_data.sort(key=lambda x: x[0])
+    def build_bitrate_pyramid(self, min_level_size=800):
+        """构建逐级 2 倍降采样的金字塔
+        
+        每层相邻两点取比特率较大者（与可视区降采样一样保留峰值），直到长度不超过
+        min_level_size。缩放/平移时按可见点数选取层级，重绘开销与像素数而非帧数成正比。
+        每层为 (times, kbps) 两列。
+        """
+        times, kbps = self.bitrate_times, self.bitrate_kbps
+        pyramid = [(times, kbps)]
+        
+        while len(kbps) > min_level_size:
+            n = len(kbps)
+            picks = [i if a >= b else i + 1 for i, a, b in zip(range(0, n - 1, 2), kbps[0::2], kbps[1::2])]
+            if n % 2:
+                picks.append(n - 1)
+            times = array.array('d', map(times.__getitem__, picks))
+            kbps = array.array('d', map(kbps.__getitem__, picks))
+            pyramid.append((times, kbps))
+        
+        self.bitrate_pyramid = pyramid
+    
+    def _select_pyramid_level(self, view_fraction, min_points):
+        """返回可见点数不少于 min_points 的最粗层级 (times, kbps)"""
+        for level_times, level_kbps in reversed(self.bitrate_pyramid):
+            if len(level_kbps) * view_fraction >= min_points:
+                return level_times, level_kbps
+        return self.bitrate_times, self.bitrate_kbps
+    
+    @staticmethod
+    def _downsample_peaks(times, kbps, start, end, max_points):
+        """将 [start, end) 区间降采样到约 max_points 个点，每个桶保留比特率最高的点
+        
+        首尾两点总是保留。返回 (times, kbps) 两列 array，未降采样时为区间切片。
+        """
+        count = end - start
+        if count <= max_points:
+            return times[start:end], kbps[start:end]
+        
+        # 整数桶边界：count > max_points 时每个桶至少含一个点，不会出现空桶，
+        # 也没有浮点步长累积的取整误差
+        edges = [start + i * count // max_points for i in range(1, max_points)]
+        picks = [start]
+        append = picks.append
+        for bucket_start, bucket_end in zip(edges, edges[1:]):
+            # 切片、max 与 index 都在 C 中完成，不再逐点回调 key 函数
+            bucket = kbps[bucket_start:bucket_end]
+            append(bucket_start + bucket.index(max(bucket)))
+        picks.append(end - 1)
+        
+        return array.array('d', map(times.__getitem__, picks)), array.array('d', map(kbps.__getitem__, picks))
+    
+    def get_thumbnail_columns(self, columns):
+        """把全部数据按时间分到 columns 个像素列，返回非空列的 (列号, 最小值, 最大值) 三个列表
+        
+        结果按列数缓存，只在缩略图宽度变化或重新分析后重算。
+        """
+        cached = self.thumbnail_columns
+        if cached is not None and cached[0] == columns and cached[1] is self.bitrate_kbps:
+            return cached[2]
+        
+        times, kbps = self.bitrate_times, self.bitrate_kbps
+        max_time = times[-1]
+        edges = [0]
+        edges.extend(bisect.bisect_left(times, max_time * c / columns) for c in range(1, columns))
+        edges.append(len(kbps))
+        
+        cols, mins, maxs = [], [], []
+        for c, (a, b) in enumerate(zip(edges, edges[1:])):
+            if a < b:
+                bucket = kbps[a:b]
+                cols.append(c)
+                mins.append(min(bucket))
+                maxs.append(max(bucket))
+        
+        result = (cols, mins, maxs)
+        self.thumbnail_columns = (columns, self.bitrate_kbps, result)
+        return result
     
     def get_visible_data(self, view_start_time, view_end_time, max_points=1500):
-        if not self.bitrate_data:
-            return []
+        """返回可见区间降采样后的 (times, kbps)"""
+        if not self.bitrate_kbps:
+            return array.array('d'), array.array('d')
         
-        start_idx = bisect.bisect_left(self.time_index, view_start_time)
-        end_idx = bisect.bisect_right(self.time_index, view_end_time)
+        total_time = self.bitrate_times[-1] if self.bitrate_times else 0
+        view_fraction = (view_end_time - view_start_time) / total_time if total_time > 0 else 1.0
+        level_times, level_kbps = self._select_pyramid_level(view_fraction, max_points * 2)
         
+        # 两侧各多取一个点，折线延伸到绘图区边缘
+        start_idx, end_idx = self._view_slice(level_times, view_start_time, view_end_time)
         start_idx = max(0, start_idx - 1)
-        end_idx = min(len(self.bitrate_data), end_idx + 1)
-        
-        visible_data = self.bitrate_data[start_idx:end_idx]
-        
-        if len(visible_data) <= max_points:
-            return visible_data
-        
-        step = len(visible_data) / max_points
-        sampled_data = [visible_data[0]]
+        end_idx = min(len(level_kbps), end_idx + 1)
         
-        for i in range(1, max_points - 1):
-            bucket_start = int(i * step)
-            bucket_end = int((i + 1) * step)
-            bucket = visible_data[bucket_start:bucket_end]
-            if bucket:
-                max_point = max(bucket, key=lambda x: x[1])
-                sampled_data.append(max_point)
-        
-        sampled_data.append(visible_data[-1])
-        sampled_data.sort(key=lambda x: x[0])
-        return sampled_data
+        return self._downsample_peaks(level_times, level_kbps, start_idx, end_idx, max_points)
+    
+    @staticmethod
+    def _build_stats_index(kbps):
+        """构建区间统计索引：前缀和（任意区间平均值两次查表）与分块最小/最大值"""
+        cumsum = array.array('d', [0.0])
+        cumsum.extend(itertools.accumulate(kbps))
+        block = _STATS_BLOCK
+        block_min = array.array('d', (min(kbps[i:i + block]) for i in range(0, len(kbps), block)))
+        block_max = array.array('d', (max(kbps[i:i + block]) for i in range(0, len(kbps), block)))
+        return cumsum, block_min, block_max
+    
+    def _range_stats(self, lo, hi):
+        """返回原始数据 [lo, hi) 区间的 (平均值, 最小值, 最大值)，要求 lo < hi
+        
+        平均值来自前缀和；最小/最大值对整块查分块表，只有首尾不足一块的部分逐点比较，
+        全视图下的开销与块数而非点数成正比。
+        """
+        kbps = self.bitrate_kbps
+        avg = (self.bitrate_cumsum[hi] - self.bitrate_cumsum[lo]) / (hi - lo)
+        
+        block = _STATS_BLOCK
+        first_block = -(-lo // block)
+        last_block = hi // block
+        if first_block >= last_block:
+            part = kbps[lo:hi]
+            return avg, min(part), max(part)
+        
+        mins = [min(self.bitrate_block_min[first_block:last_block])]
+        maxs = [max(self.bitrate_block_max[first_block:last_block])]
+        for part in (kbps[lo:first_block * block], kbps[last_block * block:hi]):
+            if part:
+                mins.append(min(part))
+                maxs.append(max(part))
+        return avg, min(mins), max(maxs)
+    
+    @staticmethod
+    def _view_slice(times, view_start_time, view_end_time):
+        """二分查找时间落在 [view_start_time, view_end_time] 内的下标区间 [lo, hi)"""
+        lo = bisect.bisect_left(times, view_start_time)
+        hi = bisect.bisect_right(times, view_end_time, lo)
+        return lo, hi
     
     def get_video_info(self):
         kwargs = self.get_subprocess_kwargs()
+        # 只请求用到的字段，JSON 输出保持在几百字节
         cmd = [
             self.ffprobe_path, "-v", "error", "-print_format", "json",
-            "-show_format", "-show_streams", self.video_path
+            "-show_entries",
+            "format=duration,size,bit_rate"
+            ":stream=codec_type,codec_name,width,height,r_frame_rate,avg_frame_rate,duration"
+            ":stream_disposition=attached_pic",
+            self.video_path
         ]
         result = subprocess.run(cmd, **kwargs)
         
+        self.video_stream_index = None
         duration = None
         video_info = {"codec": "N/A", "width": 0, "height": 0, "fps": "25", "size": 0, "bitrate": 0}
         
@@ -1369,33 +2159,38 @@ class BitrateAnalyzer:
                     video_info["size"] = int(fmt.get("size", 0) or 0)
                     video_info["bitrate"] = int(fmt.get("bit_rate", 0) or 0)
                 
+                video_index = 0
                 for stream in data.get("streams", []):
+                    if stream.get("codec_type") != "video":
+                        continue
                     if stream.get("disposition", {}).get("attached_pic", 0) == 1:
+                        video_index += 1
                         continue
-                    if stream.get("codec_type") == "video":
-                        video_info["codec"] = stream.get("codec_name", "N/A").upper()
-                        video_info["width"] = stream.get("width", 0)
-                        video_info["height"] = stream.get("height", 0)
-                        
-                        fps_str = stream.get("r_frame_rate") or stream.get("avg_frame_rate", "25/1")
-                        try:
-                            if '/' in fps_str:
-                                num, den = map(int, fps_str.split('/'))
-                                if den > 0:
-                                    video_info["fps"] = f"{num/den:.2f}"
-                            else:
-                                video_info["fps"] = fps_str
-                        except:
-                            video_info["fps"] = "25"
-                        
-                        if duration is None or duration <= 0:
-                            stream_duration = stream.get("duration")
-                            if stream_duration:
-                                try:
-                                    duration = float(stream_duration)
-                                except:
-                                    pass
-                        break
+                    # 与 -select_streams v:N 的序号一致，读取包数据时无需再次探测
+                    self.video_stream_index = video_index
+                    video_info["codec"] = stream.get("codec_name", "N/A").upper()
+                    video_info["width"] = stream.get("width", 0)
+                    video_info["height"] = stream.get("height", 0)
+                    
+                    fps_str = stream.get("r_frame_rate") or stream.get("avg_frame_rate", "25/1")
+                    try:
+                        if '/' in fps_str:
+                            num, den = map(int, fps_str.split('/'))
+                            if den > 0:
+                                video_info["fps"] = f"{num/den:.2f}"
+                        else:
+                            video_info["fps"] = fps_str
+                    except:
+                        video_info["fps"] = "25"
+                    
+                    if duration is None or duration <= 0:
+                        stream_duration = stream.get("duration")
+                        if stream_duration:
+                            try:
+                                duration = float(stream_duration)
+                            except:
+                                pass
+                    break
             except json.JSONDecodeError:
                 pass
         
@@ -1422,16 +2217,225 @@ class BitrateAnalyzer:
         return None
     
     def get_packets_data(self, duration):
-        video_stream = self.find_video_stream_index()
+        """获取按 pts 排序的 (pts_arr, sizes)，失败时返回 None
+        
+        依次查找内存缓存、磁盘缓存，均未命中时才运行 ffprobe。
+        只改变采样窗口时不再重新读取包数据。关键帧时间同时写入 self.keyframe_times。
+        """
+        cache_key = self._packet_cache_key()
+        packets = None
+        if cache_key is not None:
+            if self.packet_cache is not None and self.packet_cache[0] == cache_key:
+                packets = self.packet_cache[1:]
+            else:
+                packets = self._load_packet_cache(cache_key)
+                if packets is not None:
+                    self.packet_cache = (cache_key,) + packets
+        
+        if packets is None:
+            packets = self._probe_packets(duration)
+            if packets is None:
+                return None
+            if cache_key is not None:
+                self.packet_cache = (cache_key,) + packets
+                self._save_packet_cache(cache_key, *packets)
+        
+        pts_arr, sizes, keyframe_times = packets
+        self.keyframe_times = keyframe_times
+        return pts_arr, sizes
+    
+    def _packet_cache_key(self):
+        """以文件首尾各 1MB 内容加文件大小计算缓存键
+        
+        与路径和修改时间无关，重命名或移动文件后仍能命中缓存；只读 2MB，不必哈希整个文件。
+        """
+        chunk = _PACKET_CACHE_HASH_BYTES
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(self.video_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                digest.update(f.read(chunk))
+                if size > chunk:
+                    f.seek(max(chunk, size - chunk))
+                    digest.update(f.read(chunk))
+        except OSError:
+            return None
+        digest.update(size.to_bytes(8, "little"))
+        return digest.hexdigest()
+    
+    def _load_packet_cache(self, cache_key):
+        path = os.path.join(_user_cache_dir(), cache_key + ".pkt")
+        try:
+            with open(path, "rb") as f:
+                header = f.read(len(_PACKET_CACHE_MAGIC) + 16)
+                if len(header) < len(_PACKET_CACHE_MAGIC) + 16 or not header.startswith(_PACKET_CACHE_MAGIC):
+                    return None
+                count, key_count = struct.unpack("<qq", header[len(_PACKET_CACHE_MAGIC):])
+                pts_arr = array.array('d')
+                sizes = array.array('q')
+                keyframe_times = array.array('d')
+                pts_arr.fromfile(f, count)
+                sizes.fromfile(f, count)
+                keyframe_times.fromfile(f, key_count)
+            if sys.byteorder != "little":
+                pts_arr.byteswap()
+                sizes.byteswap()
+                keyframe_times.byteswap()
+            return pts_arr, sizes, keyframe_times
+        except (OSError, EOFError, struct.error):
+            return None
+    
+    def _save_packet_cache(self, cache_key, pts_arr, sizes, keyframe_times):
+        cache_dir = _user_cache_dir()
+        path = os.path.join(cache_dir, cache_key + ".pkt")
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(_PACKET_CACHE_MAGIC + struct.pack("<qq", len(pts_arr), len(keyframe_times)))
+                if sys.byteorder != "little":
+                    pts_arr = array.array('d', pts_arr)
+                    sizes = array.array('q', sizes)
+                    keyframe_times = array.array('d', keyframe_times)
+                    pts_arr.byteswap()
+                    sizes.byteswap()
+                    keyframe_times.byteswap()
+                pts_arr.tofile(f)
+                sizes.tofile(f)
+                keyframe_times.tofile(f)
+            os.replace(tmp_path, path)
+            self._prune_packet_cache(cache_dir)
+        except OSError as e:
+            print(f"[Cache] Write error: {e}")
+            try:
+                os.unlink(tmp_path)
+            except:
+                pass
+    
+    def _prune_packet_cache(self, cache_dir):
+        # 只保留最近写入的若干个缓存文件
+        try:
+            entries = [
+                os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                if name.endswith(".pkt")
+            ]
+            if len(entries) <= _PACKET_CACHE_MAX_FILES:
+                return
+            entries.sort(key=os.path.getmtime, reverse=True)
+            for path in entries[_PACKET_CACHE_MAX_FILES:]:
+                os.unlink(path)
+        except OSError:
+            pass
+    
+    def _probe_packets(self, duration):
+        """流式读取 ffprobe 的 CSV 包信息
+        
+        长视频按时间分段，多个 ffprobe 并发读取；分段结果不完整时回退到单进程整段读取。
+        返回按 pts 排序的 (pts_arr, sizes) 两个并行数组（array 'd' / 'q'）及升序的关键帧时间，
+        失败时返回 None。
+        """
+        video_stream = self.video_stream_index
+        if video_stream is None:
+            video_stream = self.find_video_stream_index()
         stream_spec = f"v:{video_stream}" if video_stream is not None else "v:0"
         
+        num_segments = min(_PROBE_MAX_SEGMENTS, self.cpu_manager.total_cores,
+                           int(duration // _PROBE_SEGMENT_MIN_DURATION))
+        if num_segments > 1:
+            packets = self._probe_packets_segmented(stream_spec, duration, num_segments)
+            if packets is not None:
+                return packets
+        
+        # 结构数组（SoA）：每帧只占 16 字节，且可直接用于二分查找和前缀和
+        pts_buf = array.array('d')
+        size_buf = array.array('q')
+        key_buf = array.array('d')
+        
+        def on_block():
+            if pts_buf:
+                progress = 8 + min(1.0, pts_buf[-1] / duration) * 67
+                self.update_progress(progress, f"{self.get_text('read_frames')} {len(pts_buf)}")
+        
+        if not self._run_packet_probe(stream_spec, None, pts_buf, size_buf, key_buf, on_block) or not pts_buf:
+            return None
+        return self._sort_packets(pts_buf, size_buf, key_buf)
+    
+    def _probe_packets_segmented(self, stream_spec, duration, num_segments):
+        """把 [0, duration] 等分为若干段，每段一个 ffprobe -read_intervals 并发读取
+        
+        每段只保留 pts 落在 [start, end) 内的包，段间不重不漏；
+        任一段失败或未能覆盖其边界时返回 None。
+        """
+        seg_len = duration / num_segments
+        bounds = [i * seg_len for i in range(num_segments + 1)]
+        # 首段不设下界，末段不设上界，起始时间非零或时长不准的文件也不会丢包
+        bounds[0] = -math.inf
+        bounds[-1] = math.inf
+        buffers = [(array.array('d'), array.array('q'), array.array('d')) for _ in range(num_segments)]
+        read_counts = [0] * num_segments
+        covered = [0.0] * num_segments
+        
+        def probe_segment(i):
+            start, end = bounds[i], bounds[i + 1]
+            # seek 落在 start 之前的关键帧；结束点多读一段余量，覆盖 B 帧重排
+            interval = "%" if start == -math.inf else f"{start:.6f}%"
+            if end != math.inf:
+                interval += f"{end + _PROBE_SEGMENT_MARGIN:.6f}"
+            
+            raw_pts = array.array('d')
+            raw_sizes = array.array('q')
+            raw_keys = array.array('d')
+            
+            def on_block():
+                if raw_pts:
+                    read_counts[i] = len(raw_pts)
+                    covered[i] = min(seg_len, max(0.0, raw_pts[-1] - i * seg_len))
+                    progress = 8 + min(1.0, sum(covered) / duration) * 67
+                    self.update_progress(progress, f"{self.get_text('read_frames')} {sum(read_counts)}")
+            
+            if not self._run_packet_probe(stream_spec, interval, raw_pts, raw_sizes, raw_keys, on_block):
+                return False
+            # 确认本段实际覆盖了 [start, end)：seek 不精确的容器会在边界处漏包
+            if start != -math.inf and (not raw_pts or min(raw_pts) > start):
+                return False
+            if end != math.inf and (not raw_pts or max(raw_pts) < end):
+                return False
+            
+            pts_buf, size_buf, key_buf = buffers[i]
+            for pts, size in zip(raw_pts, raw_sizes):
+                if start <= pts < end:
+                    pts_buf.append(pts)
+                    size_buf.append(size)
+            key_buf.extend(t for t in raw_keys if start <= t < end)
+            return True
+        
+        with ThreadPoolExecutor(max_workers=num_segments) as executor:
+            ok = all(list(executor.map(probe_segment, range(num_segments))))
+        if not ok:
+            return None
+        
+        pts_buf, size_buf, key_buf = buffers[0]
+        for seg_pts, seg_sizes, seg_keys in buffers[1:]:
+            pts_buf.extend(seg_pts)
+            size_buf.extend(seg_sizes)
+            key_buf.extend(seg_keys)
+        if not pts_buf:
+            return None
+        return self._sort_packets(pts_buf, size_buf, key_buf)
+    
+    def _run_packet_probe(self, stream_spec, read_interval, pts_buf, size_buf, key_buf, on_block=None):
+        """运行一个 ffprobe 读取包信息并解析到 pts_buf/size_buf/key_buf，成功返回 True"""
+        # CSV 输出字段顺序固定为 pts_time,dts_time,size,flags
         cmd = [
-            self.ffprobe_path, "-v", "error", "-print_format", "json",
+            self.ffprobe_path, "-v", "error", "-of", "csv=p=0",
             "-show_entries", "packet=pts_time,dts_time,size,flags",
-            "-select_streams", stream_spec, self.video_path
+            "-select_streams", stream_spec
         ]
+        if read_interval is not None:
+            cmd += ["-read_intervals", read_interval]
+        cmd.append(self.video_path)
         
-        kwargs = {"stdout": subprocess.PIPE, "stderr": subprocess.PIPE}
+        kwargs = {"stdout": subprocess.PIPE, "stderr": subprocess.DEVNULL, "bufsize": 1 << 20}
         if platform.system() == "Windows":
             kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
         
@@ -1440,32 +2444,79 @@ class BitrateAnalyzer:
         if self.cpu_manager.supported:
             self.cpu_manager.set_subprocess_affinity(process)
         
-        output_chunks = []
-        bytes_read = 0
-        estimated_size = max(duration * 30 * 50, 10000)
+        remainder = b""
         
+        # 按 1MB 块读取，整块拆分字段后批量转换，避免逐行分配元组
         while True:
-            chunk = process.stdout.read(131072)
-            if not chunk:
+            block = process.stdout.read(1 << 20)
+            if not block:
                 break
-            output_chunks.append(chunk)
-            bytes_read += len(chunk)
-            progress = min(75, 8 + (bytes_read / estimated_size) * 67)
-            kb_read = bytes_read / 1024
-            self.update_progress(progress, f"{self.get_text('read_frames')} {kb_read:.0f} KB")
+            block = remainder + block
+            cut = block.rfind(b"\n") + 1
+            remainder = block[cut:]
+            self._parse_packet_block(block[:cut], pts_buf, size_buf, key_buf)
+            if on_block is not None:
+                on_block()
         
-        process.wait()
+        if remainder:
+            self._parse_packet_block(remainder, pts_buf, size_buf, key_buf)
         
-        if process.returncode != 0:
-            return None
-        
-        output = b"".join(output_chunks).decode('utf-8', errors='ignore')
+        process.wait()
+        return process.returncode == 0
+    
+    @staticmethod
+    def _sort_packets(pts_buf, size_buf, key_buf):
+        # 包按解码顺序输出，存在 B 帧时 pts 不单调，按 pts 稳定排序
+        order = sorted(range(len(pts_buf)), key=pts_buf.__getitem__)
+        pts_arr = array.array('d', map(pts_buf.__getitem__, order))
+        sizes = array.array('q', map(size_buf.__getitem__, order))
+        return pts_arr, sizes, array.array('d', sorted(key_buf))
+    
+    @staticmethod
+    def _parse_packet_block(block, pts_buf, size_buf, key_buf):
+        """解析若干行 pts_time,dts_time,size,flags，追加到 pts_buf/size_buf，关键帧 pts 追加到 key_buf"""
+        fields = block.replace(b"\r", b"").replace(b"\n", b",").split(b",")
+        if fields and not fields[-1]:
+            fields.pop()
+        
+        # 快速路径：每行恰好 4 列时按步长整列转换；
+        # 个别 pts 为 N/A 时只对 pts 列逐项回退到 dts，整块仍走列转换
+        if len(fields) % 4 == 0:
+            try:
+                pts_col = fields[0::4]
+                try:
+                    pts_values = list(map(float, pts_col))
+                except ValueError:
+                    pts_values = [
+                        float(pts if pts and pts != b"N/A" else dts)
+                        for pts, dts in zip(pts_col, fields[1::4])
+                    ]
+                size_values = list(map(int, fields[2::4]))
+            except ValueError:
+                pass
+            else:
+                pts_buf.extend(pts_values)
+                size_buf.extend(size_values)
+                key_buf.extend(pts for pts, flags in zip(pts_values, fields[3::4]) if b"K" in flags)
+                return
         
-        try:
-            data = json.loads(output)
-            return data.get("packets", [])
-        except json.JSONDecodeError:
-            return None
+        # 含 N/A 或格式异常的块逐行解析，pts 缺失时回退到 dts
+        for line in block.splitlines():
+            fields = line.split(b",")
+            if len(fields) < 3:
+                continue
+            pts = fields[0]
+            if not pts or pts == b"N/A":
+                pts = fields[1]
+            try:
+                pts = float(pts)
+                size = int(fields[2] or 0)
+            except ValueError:
+                continue
+            pts_buf.append(pts)
+            size_buf.append(size)
+            if len(fields) > 3 and b"K" in fields[3]:
+                key_buf.append(pts)
     
     def find_video_stream_index(self):
         kwargs = self.get_subprocess_kwargs()
@@ -1488,86 +2539,104 @@ class BitrateAnalyzer:
             pass
         return 0
     
-    def calculate_bitrate_parallel(self, packets, duration, window_size, num_workers=None):
-        frame_data = []
-        for pkt in packets:
-            try:
-                pts = pkt.get("pts_time") or pkt.get("dts_time")
-                if pts is not None and pts != 'N/A':
-                    frame_data.append((float(pts), int(pkt.get("size", 0) or 0)))
-            except:
-                continue
-        
-        if not frame_data:
-            return []
-        
-        frame_data.sort(key=lambda x: x[0])
+    def calculate_bitrate_parallel(self, pts_arr, sizes, duration, window_size, num_workers=None):
+        """计算各窗口的比特率，返回按时间升序的 (times, kbps) 两列 array('d')"""
+        if not pts_arr:
+            return array.array('d'), array.array('d')
         
-        max_frame_time = frame_data[-1][0] if frame_data else 0
-        actual_duration = max(duration, max_frame_time)
+        actual_duration = max(duration, pts_arr[-1])
         
         step = window_size / 2
-        time_points = []
-        t = 0.0
-        while t <= actual_duration:
-            time_points.append(t)
-            t += step
+        num_points = int(actual_duration / step) + 1
+        time_points = [i * step for i in range(num_points)]
         
         if num_workers is None:
             num_workers = self.cpu_manager.total_cores
         
-        if len(time_points) < 50 or num_workers <= 1:
-            return self._calculate_bitrate_single(frame_data, time_points, window_size)
+        cum_bits = array.array('q', [0])
+        cum_bits.extend(itertools.accumulate(size * 8 for size in sizes))
         
-        chunk_size = max(1, len(time_points) // num_workers)
+        # 前缀和扫描为 O(N+M)，常规视频单进程即可在百毫秒内完成；
+        # 只有工作量足以抵消进程池启动与共享内存开销时才并行
+        if len(pts_arr) + num_points < self.parallel_min_work or num_workers <= 1:
+            return self._calculate_bitrate_single(pts_arr, cum_bits, time_points, window_size)
+        
+        # 帧数据只写入共享内存一次，worker 挂载后零拷贝读取
+        
+        # 每个 worker 负责一段连续时间，只扫描与之相交的帧区间
+        chunk_size = max(1, num_points // num_workers)
         chunks = []
-        for i in range(0, len(time_points), chunk_size):
-            chunks.append(time_points[i:i + chunk_size])
+        for first in range(0, num_points, chunk_size):
+            count = min(chunk_size, num_points - first)
+            t_first = first * step
+            t_last = (first + count - 1) * step
+            frame_start = bisect.bisect_left(pts_arr, t_first)
+            frame_stop = bisect.bisect_left(pts_arr, t_last + window_size)
+            chunks.append(((first, count, step), (frame_start, frame_stop)))
         
         actual_workers = min(len(chunks), num_workers)
         shared_mask = self.cpu_manager.get_shared_mask()
         
         self.update_progress(82, self.get_text("using_processes", count=actual_workers))
         
-        results = []
+        times = array.array('d')
+        kbps = array.array('d')
+        shm = None
         try:
+            # pts 与比特前缀和放在同一块共享内存中，只需创建与清理一次
+            shm, shm_layout = _create_shared_arrays((pts_arr, cum_bits))
+            # worker 初始化时依次领取序号，据此各自绑定到不同核心
+            worker_counter = multiprocessing.Value('i', 0)
+            
             with ProcessPoolExecutor(
-                max_workers=num_workers,
+                max_workers=actual_workers,
                 initializer=_worker_init,
-                initargs=(shared_mask,)
+                initargs=(shared_mask, worker_counter, shm.name, shm_layout)
             ) as executor:
                 futures = [
-                    executor.submit(_calculate_chunk, frame_data, chunk, window_size)
-                    for chunk in chunks
+                    executor.submit(_calculate_chunk, time_range, frame_range, window_size)
+                    for time_range, frame_range in chunks
                 ]
+                # 各块按时间顺序划分并按提交顺序收集，直接拼接即为升序，无需再排序
                 for i, future in enumerate(futures):
-                    results.extend(future.result())
+                    chunk_times, chunk_kbps = future.result()
+                    times.extend(chunk_times)
+                    kbps.extend(chunk_kbps)
                     progress = 82 + (i + 1) / len(futures) * 15
                     self.update_progress(progress, self.get_text("calculating", current=i+1, total=len(futures)))
         except Exception as e:
             print(f"Parallel error: {e}")
-            return self._calculate_bitrate_single(frame_data, time_points, window_size)
+            return self._calculate_bitrate_single(pts_arr, cum_bits, time_points, window_size)
+        finally:
+            if shm is not None:
+                try:
+                    shm.close()
+                    shm.unlink()
+                except Exception:
+                    pass
         
-        results.sort(key=lambda x: x[0])
-        return results
+        return times, kbps
     
-    def _calculate_bitrate_single(self, frame_data, time_points, window_size):
-        results = []
+    def _calculate_bitrate_single(self, pts_arr, cum_bits, time_points, window_size):
+        times = array.array('d')
+        kbps = array.array('d')
         total = len(time_points)
+        batch_size = 4096
+        # 帧密度对整段视频取平均即可决定内核的推进方式
+        use_bisect = len(pts_arr) > total * _BISECT_DENSITY
         
-        for i, t in enumerate(time_points):
-            total_bits = sum(
-                size * 8 for pts, size in frame_data
-                if t <= pts < t + window_size
-            )
-            bitrate_kbps = total_bits / window_size / 1000
-            results.append((t + window_size / 2, bitrate_kbps))
+        for i in range(0, total, batch_size):
+            batch = time_points[i:i + batch_size]
+            frame_start = bisect.bisect_left(pts_arr, batch[0])
+            batch_times, batch_kbps = _bitrate_kernel(pts_arr, cum_bits, batch, window_size, frame_start,
+                                                      use_bisect=use_bisect)
+            times.extend(batch_times)
+            kbps.extend(batch_kbps)
             
-            if i % 100 == 0:
-                progress = 82 + (i / total) * 15
-                self.update_progress(progress, self.get_text("calc_bitrate", current=i, total=total))
+            progress = 82 + (i / total) * 15
+            self.update_progress(progress, self.get_text("calc_bitrate", current=i, total=total))
         
-        return results
+        return times, kbps
     
     @staticmethod
     def calculate_nice_scale(data_min, data_max, num_ticks=6):
@@ -1607,52 +2676,151 @@ class BitrateAnalyzer:
         
         return nice_min, nice_max, nice_step, tick_values
     
-    def draw_chart(self):
-        self.canvas.delete("all")
-        self.crosshair_items = []
+    def _ensure_chart_items(self):
+        """首次绘制时创建固定的图元，之后的重绘只更新坐标与文本"""
+        if self.chart_items:
+            return
         
+        # 所有图元带 "chart" 标签以便整体隐藏；"chart_static" 为每次绘制都显示的部分
+        canvas = self.canvas
+        r = self.crosshair_r
+        static = ("chart", "chart_static")
+        crosshair = ("chart", "crosshair")
+        self.chart_items = {
+            'frame': canvas.create_rectangle(0, 0, 0, 0, fill="#fafafa", outline="", tags=static),
+            'grid_h': canvas.create_line(0, 0, 0, 0, fill="#e0e0e0", state="hidden", tags="chart"),
+            'grid_v': canvas.create_line(0, 0, 0, 0, fill="#e0e0e0", state="hidden", tags="chart"),
+            # 边框单独绘制在网格之上，盖住网格折线沿边框的连接段
+            'border': canvas.create_rectangle(0, 0, 0, 0, fill="", outline="#ccc", tags=static),
+            'fill': canvas.create_polygon(
+                0, 0, 0, 0, 0, 0, fill="#bbdefb", outline="", state="hidden", tags="chart"
+            ),
+            'line': canvas.create_line(0, 0, 0, 0, fill="#1976D2", width=2, state="hidden", tags="chart"),
+            'avg_line': canvas.create_line(
+                0, 0, 0, 0, fill="#ff9800", width=2, dash=(8, 4), state="hidden", tags="chart"
+            ),
+            'avg_text': canvas.create_text(
+                0, 0, anchor="e", font=self.fonts["normal"], fill="#e65100", state="hidden", tags="chart"
+            ),
+            'title': canvas.create_text(0, 0, anchor="w", font=self.fonts["chart_title"], fill="#333", tags=static),
+            'stats': canvas.create_text(0, 0, anchor="e", font=self.fonts["normal"], fill="#666", tags=static),
+            'x_title': canvas.create_text(0, 0, font=self.fonts["normal"], fill="#666", tags=static),
+            'y_title': canvas.create_text(0, 0, font=self.fonts["normal"], fill="#666", angle=90, tags=static),
+            # 十字线三个图元共用 "crosshair" 标签，显示/隐藏各只需一次调用
+            'cross_v': canvas.create_line(
+                0, 0, 0, 0, fill="#f44336", dash=(3, 3), width=1, state="hidden", tags=crosshair
+            ),
+            'cross_h': canvas.create_line(
+                0, 0, 0, 0, fill="#f44336", dash=(3, 3), width=1, state="hidden", tags=crosshair
+            ),
+            'cross_dot': canvas.create_oval(
+                -r, -r, r, r, fill="#f44336", outline="white", width=2, state="hidden", tags=crosshair
+            ),
+            'hint': canvas.create_text(0, 0, font=self.fonts["title"], fill="#999", state="hidden", tags="chart"),
+            # 刻度标签池，按需扩充，多余的隐藏
+            'y_labels': [],
+            'x_labels': [],
+        }
+    
+    def _set_polyline(self, item, coords):
+        if len(coords) >= 4:
+            self.canvas.coords(item, coords)
+            self.canvas.itemconfigure(item, state="normal")
+        else:
+            self.canvas.itemconfigure(item, state="hidden")
+    
+    def _set_chart_text(self, item, x, y, text):
+        """只在位置或内容变化时更新文本图元"""
+        last = self.chart_text_state.get(item)
+        if last is None or last[0] != x or last[1] != y:
+            self.canvas.coords(item, x, y)
+        if last is None or last[2] != text:
+            self.canvas.itemconfigure(item, text=text)
+        self.chart_text_state[item] = (x, y, text)
+    
+    def _update_label_pool(self, name, labels, anchor):
+        """复用池中的文本图元显示 [(x, y, text), ...]"""
+        canvas = self.canvas
+        pool = self.chart_items[name]
+        while len(pool) < len(labels):
+            pool.append(canvas.create_text(0, 0, anchor=anchor, font=self.fonts["chart"], fill="#666", tags="chart"))
+        
+        for item, (x, y, text) in zip(pool, labels):
+            self._set_chart_text(item, x, y, text)
+        # 只切换显示数量变化的那部分图元
+        shown = self.label_pool_shown.get(name, 0)
+        for item in pool[shown:len(labels)]:
+            canvas.itemconfigure(item, state="normal")
+        for item in pool[len(labels):shown]:
+            canvas.itemconfigure(item, state="hidden")
+        self.label_pool_shown[name] = len(labels)
+    
+    def _hide_chart_items(self):
+        """隐藏全部图元而不删除，图表恢复时直接复用"""
+        if self.chart_items:
+            self.canvas.itemconfigure("chart", state="hidden")
+        self.label_pool_shown = {}
+        self.crosshair_visible = False
+        self.chart_info = None
+        self.visible_xs = []
+    
+    def _show_chart_hint(self, width, height):
+        self._ensure_chart_items()
+        self._hide_chart_items()
+        hint = self.chart_items['hint']
+        self._set_chart_text(hint, width / 2, height / 2, self.get_text("select_video_hint"))
+        self.canvas.itemconfigure(hint, state="normal")
+    
+    def _show_crosshair(self):
+        if not self.crosshair_visible:
+            self.canvas.itemconfigure("crosshair", state="normal")
+            self.crosshair_visible = True
+    
+    def _hide_crosshair(self):
+        if self.crosshair_visible:
+            self.canvas.itemconfigure("crosshair", state="hidden")
+            self.crosshair_visible = False
+    
+    def draw_chart(self):
         width = self.canvas.winfo_width()
         height = self.canvas.winfo_height()
+        self.chart_drawn_size = (width, height)
         
         if width < 100 or height < 100:
+            self._hide_chart_items()
             return
         
-        if not self.bitrate_data:
-            self.canvas.create_text(
-                width / 2, height / 2,
-                text=self.get_text("select_video_hint"),
-                font=self.fonts["title"], fill="#999"
-            )
+        if not self.bitrate_kbps:
+            self._show_chart_hint(width, height)
             return
         
-        max_time = self.time_index[-1] if self.time_index else 1
+        max_time = self.bitrate_times[-1] if self.bitrate_times else 1
         view_start_time = self.view_start * max_time
         view_end_time = self.view_end * max_time
         
-        view_range = self.view_end - self.view_start
-        if view_range > 0.8:
-            max_points = 800
-        elif view_range > 0.5:
-            max_points = 1200
-        else:
-            max_points = 1500
-        
-        visible_data = self.get_visible_data(view_start_time, view_end_time, max_points)
-        if not visible_data:
-            return
-        
-        scale = self.dpi_scale
-        margin = {
-            "left": int(85 * scale), "right": int(30 * scale),
-            "top": int(45 * scale), "bottom": int(55 * scale)
-        }
+        margin = self.chart_margin
+        offsets = self.chart_text_offsets
         chart_w = width - margin["left"] - margin["right"]
         chart_h = height - margin["top"] - margin["bottom"]
         
         if chart_w <= 0 or chart_h <= 0:
+            self._hide_chart_items()
+            return
+        
+        # 每个像素列保留约两个峰值点：再多的顶点在屏幕上也分辨不出，
+        # 金字塔层级与降采样量都随绘图区宽度而定
+        max_points = 2 * chart_w
+        visible_times, visible_bitrates = self.get_visible_data(view_start_time, view_end_time, max_points)
+        if not visible_times:
+            self._hide_chart_items()
             return
         
-        visible_bitrates = [d[1] for d in visible_data]
+        self._ensure_chart_items()
+        canvas = self.canvas
+        items = self.chart_items
+        canvas.itemconfigure(items['hint'], state="hidden")
+        canvas.itemconfigure("chart_static", state="normal")
+        
         data_max = max(visible_bitrates) if visible_bitrates else 1000
         
         nice_min, nice_max, nice_step, tick_values = self.calculate_nice_scale(0, data_max, 6)
@@ -1685,115 +2853,154 @@ class BitrateAnalyzer:
         def to_y(br):
             return chart_bottom - ((br - min_bitrate) / bitrate_range) * chart_h
         
-        self.canvas.create_rectangle(
-            chart_left, chart_top, chart_right, chart_bottom,
-            fill="#fafafa", outline="#ccc"
-        )
+        canvas.coords(items['frame'], chart_left, chart_top, chart_right, chart_bottom)
+        canvas.coords(items['border'], chart_left, chart_top, chart_right, chart_bottom)
         
+        # 同方向的网格线合并为一条往返折线，相邻两条之间的连接段落在边框上
+        h_coords = []
+        y_labels = []
         for br_val in tick_values:
             y = to_y(br_val)
             if chart_top <= y <= chart_bottom:
-                self.canvas.create_line(chart_left, y, chart_right, y, fill="#e0e0e0")
-                if br_val >= 1000:
-                    label = f"{br_val/1000:.0f} Mbps" if br_val % 1000 == 0 else f"{br_val/1000:.1f} Mbps"
+                if len(y_labels) % 2:
+                    h_coords.extend((chart_right, y, chart_left, y))
                 else:
-                    label = f"{br_val:.0f} Kbps"
-                self.canvas.create_text(
-                    chart_left - 8, y, text=label, anchor="e", font=self.fonts["chart"], fill="#666"
-                )
+                    h_coords.extend((chart_left, y, chart_right, y))
+                y_labels.append((chart_left - 8, y, self.format_tick_bitrate(br_val)))
         
+        v_coords = []
+        x_labels = []
         x_steps = min(10, max(4, int(time_range / 15)))
         for i in range(x_steps + 1):
             t_val = view_start_time + time_range * i / x_steps
             x = to_x(t_val)
-            self.canvas.create_line(x, chart_top, x, chart_bottom, fill="#e0e0e0")
-            self.canvas.create_text(
-                x, chart_bottom + int(12 * scale),
-                text=self.format_time_short(t_val), anchor="n", font=self.fonts["chart"], fill="#666"
-            )
-        
-        points = []
-        for t, br in visible_data:
-            x = to_x(t)
-            y = to_y(br)
-            points.append((x, y, t, br))
-        
-        self.current_visible_data = visible_data
-        self.current_visible_points = points
-        
-        if len(points) >= 2:
-            fill_coords = [chart_left, chart_bottom]
-            for x, y, _, _ in points:
-                x = max(chart_left, min(chart_right, x))
-                fill_coords.extend([x, y])
-            fill_coords.extend([chart_right, chart_bottom])
-            
-            self.canvas.create_polygon(fill_coords, fill="#bbdefb", outline="")
-            
-            line_coords = []
-            for x, y, _, _ in points:
-                x = max(chart_left, min(chart_right, x))
-                line_coords.extend([x, y])
-            self.canvas.create_line(line_coords, fill="#1976D2", width=2)
+            if i % 2:
+                v_coords.extend((x, chart_bottom, x, chart_top))
+            else:
+                v_coords.extend((x, chart_top, x, chart_bottom))
+            x_labels.append((x, chart_bottom + offsets["x_label"], self.format_time_short(t_val)))
+        
+        self._set_polyline(items['grid_h'], h_coords)
+        self._set_polyline(items['grid_v'], v_coords)
+        self._update_label_pool('y_labels', y_labels, "e")
+        self._update_label_pool('x_labels', x_labels, "n")
+        
+        # 采样点到像素是仿射变换：斜率与截距预先算好，逐点只剩一次乘加，不再调用闭包
+        x_scale = chart_w / time_range
+        x_offset = chart_left - view_start_time * x_scale
+        y_scale = chart_h / bitrate_range
+        y_offset = chart_bottom + min_bitrate * y_scale
+        xs = [x_offset + t * x_scale for t in visible_times]
+        ys = [y_offset - br * y_scale for br in visible_bitrates]
+        
+        self.visible_xs = xs
+        self.visible_ys = ys
+        self.visible_times = visible_times
+        self.visible_kbps = visible_bitrates
+        # 两端各多取的一个点落在绘图区外：落在区内的下标区间只在重绘时算一次
+        first = bisect.bisect_left(xs, chart_left)
+        self.visible_bounds = (first, bisect.bisect_right(xs, chart_right, first))
+        
+        if len(xs) >= 2:
+            # x 钳制到绘图区后与 y 按切片交错写入坐标序列
+            line_coords = [0.0] * (2 * len(xs))
+            line_coords[0::2] = [chart_left if x < chart_left else chart_right if x > chart_right else x for x in xs]
+            line_coords[1::2] = ys
+            fill_coords = [chart_left, chart_bottom] + line_coords + [chart_right, chart_bottom]
+            
+            canvas.coords(items['fill'], fill_coords)
+            canvas.coords(items['line'], line_coords)
+            canvas.itemconfigure(items['fill'], state="normal")
+            canvas.itemconfigure(items['line'], state="normal")
+        else:
+            canvas.itemconfigure(items['fill'], state="hidden")
+            canvas.itemconfigure(items['line'], state="hidden")
         
+        avg_state = "hidden"
+        stats = ""
         if visible_bitrates:
-            avg_bitrate = sum(visible_bitrates) / len(visible_bitrates)
+            # 统计量取自视图内的原始数据而非降采样后的峰值点，由统计索引查表得到
+            lo, hi = self._view_slice(self.bitrate_times, view_start_time, view_end_time)
+            if lo < hi:
+                avg_bitrate, min_br, max_br = self._range_stats(lo, hi)
+            else:
+                avg_bitrate = sum(visible_bitrates) / len(visible_bitrates)
+                min_br = min(visible_bitrates)
+                max_br = max(visible_bitrates)
             avg_y = to_y(avg_bitrate)
             
             if chart_top <= avg_y <= chart_bottom:
-                self.canvas.create_line(
-                    chart_left, avg_y, chart_right, avg_y,
-                    fill="#ff9800", width=2, dash=(8, 4)
-                )
-                avg_label = f"{avg_bitrate/1000:.2f} Mbps" if avg_bitrate >= 1000 else f"{avg_bitrate:.0f} Kbps"
-                self.canvas.create_text(
-                    chart_right - 5, avg_y - int(8 * scale),
-                    text=f"{self.get_text('average')}: {avg_label}", anchor="e", font=self.fonts["normal"], fill="#e65100"
-                )
+                avg_label = self.format_bitrate(avg_bitrate)
+                canvas.coords(items['avg_line'], chart_left, avg_y, chart_right, avg_y)
+                self._set_chart_text(items['avg_text'], chart_right - 5, avg_y - offsets["avg_label"],
+                                     f"{self.get_text('average')}: {avg_label}")
+                avg_state = "normal"
             
-            max_br = max(visible_bitrates)
-            min_br = min(visible_bitrates)
-            max_label = f"{max_br/1000:.2f} Mbps" if max_br >= 1000 else f"{max_br:.0f} Kbps"
-            min_label = f"{min_br/1000:.2f} Mbps" if min_br >= 1000 else f"{min_br:.0f} Kbps"
-            avg_label = f"{avg_bitrate/1000:.2f} Mbps" if avg_bitrate >= 1000 else f"{avg_bitrate:.0f} Kbps"
+            max_label = self.format_bitrate(max_br)
+            min_label = self.format_bitrate(min_br)
+            avg_label = self.format_bitrate(avg_bitrate)
             
             stats = f"{self.get_text('max')}: {max_label}  |  {self.get_text('min')}: {min_label}  |  {self.get_text('average')}: {avg_label}"
-            
-            self.canvas.create_text(
-                chart_left + 5, chart_top - int(25 * scale),
-                text=self.get_text("bitrate_analysis"), anchor="w", font=self.fonts["chart_title"], fill="#333"
-            )
-            self.canvas.create_text(
-                chart_right, chart_top - int(25 * scale),
-                text=stats, anchor="e", font=self.fonts["normal"], fill="#666"
-            )
         
-        self.canvas.create_text(
-            chart_left + chart_w / 2, height - int(10 * scale),
-            text=self.get_text("time"), font=self.fonts["normal"], fill="#666"
-        )
-        self.canvas.create_text(
-            int(15 * scale), chart_top + chart_h / 2,
-            text=self.get_text("bitrate"), font=self.fonts["normal"], fill="#666", angle=90
-        )
+        canvas.itemconfigure(items['avg_line'], state=avg_state)
+        canvas.itemconfigure(items['avg_text'], state=avg_state)
+        
+        title_y = chart_top - offsets["title"]
+        self._set_chart_text(items['title'], chart_left + 5, title_y,
+                             self.get_text("bitrate_analysis") if stats else "")
+        self._set_chart_text(items['stats'], chart_right, title_y, stats)
+        
+        self._set_chart_text(items['x_title'], chart_left + chart_w / 2, height - offsets["x_title"], self.get_text("time"))
+        self._set_chart_text(items['y_title'], offsets["y_title"], chart_top + chart_h / 2, self.get_text("bitrate"))
+        
+        # 数据已变化，旧的十字线不再对应任何采样点
+        self._hide_crosshair()
     
-    def draw_thumbnail(self):
-        self.thumbnail_canvas.delete("all")
-        self.selection_items = {}
+    def _ensure_thumbnail_items(self):
+        """首次绘制时创建缩略图的固定图元（含选区），之后只更新坐标"""
+        if self.thumbnail_items:
+            return
         
+        # 全部带 "thumb" 标签以便整体隐藏；创建顺序即叠放顺序，边框与选区在曲线图像之上
+        canvas = self.thumbnail_canvas
+        # 不指定尺寸：尺寸随每次载入的数据而定，显式尺寸会把之后载入的图像裁剪掉
+        self.thumbnail_image = tk.PhotoImage()
+        self.thumbnail_items = {
+            'plot': canvas.create_image(0, 0, anchor="nw", image=self.thumbnail_image, tags="thumb"),
+            'frame': canvas.create_rectangle(0, 0, 0, 0, fill="", outline="#ccc", tags="thumb"),
+        }
+        self.selection_items = {
+            'left_mask': canvas.create_rectangle(
+                0, 0, 0, 0, fill="#000000", stipple="gray50", outline="", tags="thumb"
+            ),
+            'right_mask': canvas.create_rectangle(
+                0, 0, 0, 0, fill="#000000", stipple="gray50", outline="", tags="thumb"
+            ),
+            'box': canvas.create_rectangle(0, 0, 0, 0, fill="", outline="#1976D2", width=2, tags="thumb"),
+            'handle_left': canvas.create_rectangle(0, 0, 0, 0, fill="#1976D2", outline="", tags="thumb"),
+            'handle_right': canvas.create_rectangle(0, 0, 0, 0, fill="#1976D2", outline="", tags="thumb"),
+        }
+    
+    def _hide_thumbnail_items(self):
+        if self.thumbnail_items:
+            self.thumbnail_canvas.itemconfigure("thumb", state="hidden")
+        self.thumbnail_info = None
+    
+    def draw_thumbnail(self):
         width = self.thumbnail_canvas.winfo_width()
         height = self.thumbnail_canvas.winfo_height()
+        self.thumbnail_drawn_size = (width, height)
         
-        if width < 50 or height < 30 or not self.thumbnail_data:
+        if width < 50 or height < 30 or not self.bitrate_kbps:
+            self._hide_thumbnail_items()
             return
         
-        scale = self.dpi_scale
-        margin = {"left": int(10 * scale), "right": int(10 * scale),
-                  "top": int(10 * scale), "bottom": int(10 * scale)}
+        margin = self.thumbnail_margin
         chart_w = width - margin["left"] - margin["right"]
         chart_h = height - margin["top"] - margin["bottom"]
         
         if chart_w <= 0 or chart_h <= 0:
+            self._hide_thumbnail_items()
             return
         
         self.thumbnail_info = {
@@ -1801,80 +3008,58 @@ class BitrateAnalyzer:
             "width": width, "height": height
         }
         
-        times = [d[0] for d in self.thumbnail_data]
-        bitrates = [d[1] for d in self.thumbnail_data]
-        
-        max_time = max(times)
-        max_bitrate = max(bitrates) * 1.1
-        min_bitrate = 0
-        
-        def to_x(t):
-            return margin["left"] + (t / max_time) * chart_w
-        
-        def to_y(br):
-            return height - margin["bottom"] - ((br - min_bitrate) / (max_bitrate - min_bitrate)) * chart_h
-        
-        self.thumbnail_canvas.create_rectangle(
-            margin["left"], margin["top"],
-            width - margin["right"], height - margin["bottom"],
-            fill="#f5f5f5", outline="#ccc"
-        )
-        
-        if len(self.thumbnail_data) >= 2:
-            fill_coords = []
-            for t, br in self.thumbnail_data:
-                fill_coords.extend([to_x(t), to_y(br)])
-            fill_coords.extend([
-                to_x(self.thumbnail_data[-1][0]), height - margin["bottom"],
-                to_x(self.thumbnail_data[0][0]), height - margin["bottom"]
-            ])
-            self.thumbnail_canvas.create_polygon(fill_coords, fill="#e3f2fd", outline="")
-            
-            line_coords = []
-            for t, br in self.thumbnail_data:
-                line_coords.extend([to_x(t), to_y(br)])
-            self.thumbnail_canvas.create_line(line_coords, fill="#90caf9", width=1)
-        
-        self._create_selection_items()
-    
-    def _create_selection_items(self):
-        if not self.thumbnail_info:
-            return
-        
-        info = self.thumbnail_info
-        margin = info["margin"]
-        chart_w = info["chart_w"]
-        height = info["height"]
-        
-        x1 = margin["left"] + self.view_start * chart_w
-        x2 = margin["left"] + self.view_end * chart_w
-        y1 = margin["top"]
-        y2 = height - margin["bottom"]
-        
-        handle_w = int(6 * self.dpi_scale)
+        self._ensure_thumbnail_items()
+        canvas = self.thumbnail_canvas
+        items = self.thumbnail_items
+        canvas.itemconfigure("thumb", state="normal")
+        
+        # 每个像素列只画该列的最小/最大值，顶点数与宽度成正比而不是与数据量成正比
+        cols, mins, maxs = self.get_thumbnail_columns(chart_w)
+        max_bitrate = max(maxs) * 1.1 or 1
+        
+        canvas.coords(items['frame'], margin["left"], margin["top"],
+                      width - margin["right"], height - margin["bottom"])
+        
+        # 曲线预先光栅化为一张 PPM 图像：拖动选区时 Tk 只需贴图，不必反复重绘数千个折线顶点
+        canvas.coords(items['plot'], margin["left"], margin["top"])
+        key = self.thumbnail_image_key
+        if key is None or key[0] != chart_w or key[1] != chart_h or key[2] is not self.bitrate_kbps:
+            self.thumbnail_image.configure(
+                width=chart_w, height=chart_h,
+                data=self._render_thumbnail_ppm(cols, mins, maxs, chart_w, chart_h, chart_h / max_bitrate)
+            )
+            self.thumbnail_image_key = (chart_w, chart_h, self.bitrate_kbps)
         
-        self.selection_items = {
-            'left_mask': self.thumbnail_canvas.create_rectangle(
-                margin["left"], y1, x1, y2,
-                fill="#000000", stipple="gray50", outline=""
-            ),
-            'right_mask': self.thumbnail_canvas.create_rectangle(
-                x2, y1, margin["left"] + chart_w, y2,
-                fill="#000000", stipple="gray50", outline=""
-            ),
-            'box': self.thumbnail_canvas.create_rectangle(
-                x1, y1, x2, y2,
-                fill="", outline="#1976D2", width=2
-            ),
-            'handle_left': self.thumbnail_canvas.create_rectangle(
-                x1 - handle_w // 2, y1, x1 + handle_w // 2, y2,
-                fill="#1976D2", outline=""
-            ),
-            'handle_right': self.thumbnail_canvas.create_rectangle(
-                x2 - handle_w // 2, y1, x2 + handle_w // 2, y2,
-                fill="#1976D2", outline=""
-            ),
-        }
+        self._update_selection_coords()
+    
+    @staticmethod
+    def _render_thumbnail_ppm(cols, mins, maxs, width, height, y_scale):
+        """把逐列的比特率范围画成 width x height 的 PPM 图像
+        
+        每列在最小与最大值之间画一段竖线，并延伸到与前一列相接，效果等同一条连续折线。
+        """
+        row_bytes = width * 3
+        pixels = bytearray(b"\xf5\xf5\xf5" * (width * height))
+        # 前景色三个通道各自的单字节填充值；竖线按通道用步长为一行的切片整段写入
+        channels = [(i, bytes((v,))) for i, v in enumerate(b"\x90\xca\xf9")]
+        
+        last_row = height - 1
+        prev_col = prev_top = prev_bottom = None
+        for c, low, high in zip(cols, mins, maxs):
+            top = min(last_row, max(0, int(height - high * y_scale)))
+            bottom = min(last_row, max(0, int(height - low * y_scale)))
+            span_top, span_bottom = top, bottom
+            if prev_col == c - 1:
+                span_top = min(span_top, prev_bottom)
+                span_bottom = max(span_bottom, prev_top)
+            count = span_bottom - span_top + 1
+            start = span_top * row_bytes + c * 3
+            stop = start + count * row_bytes
+            for i, value in channels:
+                pixels[start + i:stop + i:row_bytes] = value * count
+            prev_col, prev_top, prev_bottom = c, top, bottom
+        
+        return b"P6\n%d %d\n255\n" % (width, height) + bytes(pixels)
     
     def _update_selection_coords(self):
         if not self.thumbnail_info or not self.selection_items:
@@ -1882,24 +3067,32 @@ class BitrateAnalyzer:
         
         info = self.thumbnail_info
         margin = info["margin"]
+        left = margin["left"]
         chart_w = info["chart_w"]
-        height = info["height"]
         
-        x1 = margin["left"] + self.view_start * chart_w
-        x2 = margin["left"] + self.view_end * chart_w
-        y1 = margin["top"]
-        y2 = height - margin["bottom"]
+        # 选区边界取整到像素：拖动中的亚像素变化、钳制后未变的视图以及未重绘的缩略图
+        # 都得到相同的键，跳过 5 次 coords 调用
+        x1 = round(left + self.view_start * chart_w)
+        x2 = round(left + self.view_end * chart_w)
+        last = self.selection_view
+        if last is not None and last[0] == x1 and last[1] == x2 and last[2] is info:
+            return
+        self.selection_view = (x1, x2, info)
         
-        handle_w = int(6 * self.dpi_scale)
+        y1 = margin["top"]
+        y2 = info["height"] - margin["bottom"]
+        half_w = self.handle_half_w
         
-        self.thumbnail_canvas.coords(self.selection_items['left_mask'], margin["left"], y1, x1, y2)
-        self.thumbnail_canvas.coords(self.selection_items['right_mask'], x2, y1, margin["left"] + chart_w, y2)
-        self.thumbnail_canvas.coords(self.selection_items['box'], x1, y1, x2, y2)
-        self.thumbnail_canvas.coords(self.selection_items['handle_left'], x1 - handle_w // 2, y1, x1 + handle_w // 2, y2)
-        self.thumbnail_canvas.coords(self.selection_items['handle_right'], x2 - handle_w // 2, y1, x2 + handle_w // 2, y2)
+        canvas = self.thumbnail_canvas
+        items = self.selection_items
+        canvas.coords(items['left_mask'], left, y1, x1, y2)
+        canvas.coords(items['right_mask'], x2, y1, left + chart_w, y2)
+        canvas.coords(items['box'], x1, y1, x2, y2)
+        canvas.coords(items['handle_left'], x1 - half_w, y1, x1 + half_w, y2)
+        canvas.coords(items['handle_right'], x2 - half_w, y1, x2 + half_w, y2)
     
     def zoom(self, factor):
-        if not self.bitrate_data:
+        if not self.bitrate_kbps:
             return
         
         center = (self.view_start + self.view_end) / 2
@@ -1920,9 +3113,25 @@ class BitrateAnalyzer:
         self.view_start = max(0, new_start)
         self.view_end = min(1, new_end)
         
+        # 视图范围与缩略图选区立即更新，主图重绘合并到下一帧
         self.update_zoom_label()
-        self.draw_chart()
         self._update_selection_coords()
+        self._mark_chart_dirty()
+    
+    def _mark_chart_dirty(self):
+        """标记主图需要重绘；渲染循环未运行时启动它"""
+        self.chart_dirty = True
+        if self.pending_render_tick is None:
+            self.pending_render_tick = self.root.after(16, self._render_tick)
+    
+    def _render_tick(self):
+        """每 16ms 一帧：有脏标记才重绘，否则停止循环，直到下次被标记"""
+        if not self.chart_dirty:
+            self.pending_render_tick = None
+            return
+        self.chart_dirty = False
+        self.draw_chart()
+        self.pending_render_tick = self.root.after(16, self._render_tick)
     
     def reset_view(self):
         self.view_start = 0.0
@@ -1934,10 +3143,13 @@ class BitrateAnalyzer:
     def update_zoom_label(self):
         view_range = self.view_end - self.view_start
         percentage = view_range * 100
-        self.zoom_label.config(text=f"{self.get_text('display')} {percentage:.1f}%")
+        text = f"{self.get_text('display')} {percentage:.1f}%"
+        if text != self.zoom_label_text:
+            self.zoom_label_text = text
+            self.zoom_label.config(text=text)
     
     def on_mouse_wheel(self, event):
-        if not self.bitrate_data or not self.chart_info:
+        if not self.bitrate_kbps or not self.chart_info:
             return
         
         if event.num == 4 or event.delta > 0:
@@ -1972,12 +3184,13 @@ class BitrateAnalyzer:
         self.view_start = max(0, new_start)
         self.view_end = min(1, new_end)
         
+        # 视图范围与缩略图选区立即更新，主图重绘合并到下一帧
         self.update_zoom_label()
-        self.draw_chart()
         self._update_selection_coords()
+        self._mark_chart_dirty()
     
     def on_thumbnail_press(self, event):
-        if not self.thumbnail_info or not self.bitrate_data:
+        if not self.thumbnail_info or not self.bitrate_kbps:
             return
         
         info = self.thumbnail_info
@@ -1987,7 +3200,7 @@ class BitrateAnalyzer:
         x1 = margin["left"] + self.view_start * chart_w
         x2 = margin["left"] + self.view_end * chart_w
         
-        handle_w = int(10 * self.dpi_scale)
+        handle_w = self.handle_hit_w
         
         if abs(event.x - x1) < handle_w:
             self.thumbnail_dragging = True
@@ -2021,7 +3234,7 @@ class BitrateAnalyzer:
             
             self.update_zoom_label()
             self._update_selection_coords()
-            self.draw_chart()
+            self._mark_chart_dirty()
         
         self.thumbnail_drag_start_x = event.x
         self.thumbnail_drag_start_view = (self.view_start, self.view_end)
@@ -2066,10 +3279,7 @@ class BitrateAnalyzer:
         
         self.update_zoom_label()
         self._update_selection_coords()
-        
-        if self.pending_chart_draw:
-            self.root.after_cancel(self.pending_chart_draw)
-        self.pending_chart_draw = self.root.after(100, self.draw_chart)
+        self._mark_chart_dirty()
     
     def on_thumbnail_release(self, event):
         if not self.thumbnail_dragging:
@@ -2078,48 +3288,50 @@ class BitrateAnalyzer:
         self.thumbnail_dragging = False
         self.thumbnail_drag_mode = None
         
-        if self.pending_chart_draw:
-            self.root.after_cancel(self.pending_chart_draw)
-            self.pending_chart_draw = None
-        
-        self.draw_chart()
+        # 松手时若还有未渲染的变化，立即画出最终视图，不等下一帧
+        if self.chart_dirty:
+            self.chart_dirty = False
+            self.draw_chart()
     
     def on_thumbnail_double_click(self, event):
         self.reset_view()
     
     def on_thumbnail_resize(self, event):
-        if self.bitrate_data:
-            if self.pending_thumbnail_draw:
-                self.root.after_cancel(self.pending_thumbnail_draw)
-            self.pending_thumbnail_draw = self.root.after(150, self.draw_thumbnail)
+        self._schedule_resize_draw()
     
     def on_canvas_resize(self, event):
-        if self.bitrate_data:
-            if self.pending_chart_draw:
-                self.root.after_cancel(self.pending_chart_draw)
-            self.pending_chart_draw = self.root.after(150, self.draw_chart)
+        self._schedule_resize_draw()
     
-    def on_mouse_move(self, event):
-        current_time = time_module.time() * 1000
-        
-        if current_time - self.last_mouse_update < self.mouse_throttle_ms:
-            if self.pending_mouse_update:
-                self.root.after_cancel(self.pending_mouse_update)
-            self.pending_mouse_update = self.root.after(
-                self.mouse_throttle_ms,
-                lambda: self._do_mouse_update(event.x, event.y)
-            )
+    def _schedule_resize_draw(self):
+        """拖动窗口时两块画布连续收到尺寸事件，合并为停止 150ms 后的一次重绘"""
+        if not self.bitrate_kbps:
             return
-        
-        self.last_mouse_update = current_time
-        self._do_mouse_update(event.x, event.y)
+        if self.pending_resize_draw:
+            self.root.after_cancel(self.pending_resize_draw)
+        self.pending_resize_draw = self.root.after(150, self._flush_resize_draw)
+    
+    def _flush_resize_draw(self):
+        self.pending_resize_draw = None
+        canvas_size = (self.canvas.winfo_width(), self.canvas.winfo_height())
+        if canvas_size != self.chart_drawn_size:
+            self.draw_chart()
+        thumbnail_size = (self.thumbnail_canvas.winfo_width(), self.thumbnail_canvas.winfo_height())
+        if thumbnail_size != self.thumbnail_drawn_size:
+            self.draw_thumbnail()
+    
+    def on_mouse_move(self, event):
+        # 只记录最新坐标；空闲时统一处理一次，快速移动产生的多个事件自然合并
+        self.last_mouse_xy = (event.x, event.y)
+        if self.pending_mouse_update is None:
+            self.pending_mouse_update = self.root.after_idle(self._flush_mouse_update)
+    
+    def _flush_mouse_update(self):
+        self.pending_mouse_update = None
+        if self.last_mouse_xy is not None:
+            self._do_mouse_update(*self.last_mouse_xy)
     
     def _do_mouse_update(self, x, y):
-        for item in self.crosshair_items:
-            self.canvas.delete(item)
-        self.crosshair_items = []
-        
-        if not self.chart_info or not self.current_visible_points:
+        if not self.chart_info or not self.visible_xs or not self.chart_items:
             return
         
         info = self.chart_info
@@ -2128,48 +3340,36 @@ class BitrateAnalyzer:
         chart_top = info["chart_top"]
         chart_bottom = info["chart_bottom"]
         
-        if not (chart_left <= x <= chart_right and chart_top <= y <= chart_bottom):
-            self.cursor_info_label.config(text="")
-            self.hide_preview()
-            return
-        
-        min_dist = float('inf')
-        closest_point = None
-        
-        for point_x, point_y, t, br in self.current_visible_points:
-            if chart_left <= point_x <= chart_right:
-                dist = abs(point_x - x)
-                if dist < min_dist:
-                    min_dist = dist
-                    closest_point = (point_x, point_y, t, br)
-        
-        if closest_point is None:
+        # visible_xs 按 x 递增，绘图区内的点段 [lo, hi) 已在重绘时算好；
+        # 鼠标在绘图区外或区内没有点时直接返回
+        lo, hi = self.visible_bounds
+        if lo >= hi or not (chart_left <= x <= chart_right and chart_top <= y <= chart_bottom):
+            self._hide_crosshair()
             self.cursor_info_label.config(text="")
             self.hide_preview()
             return
         
-        point_x, point_y, t, br = closest_point
-        point_x = max(chart_left, min(chart_right, point_x))
-        point_y = max(chart_top, min(chart_bottom, point_y))
-        
-        v_line = self.canvas.create_line(
-            point_x, chart_top, point_x, chart_bottom,
-            fill="#f44336", dash=(3, 3), width=1
-        )
-        h_line = self.canvas.create_line(
-            chart_left, point_y, chart_right, point_y,
-            fill="#f44336", dash=(3, 3), width=1
-        )
-        
-        r = int(5 * self.dpi_scale)
-        point_marker = self.canvas.create_oval(
-            point_x - r, point_y - r, point_x + r, point_y + r,
-            fill="#f44336", outline="white", width=2
-        )
-        
-        self.crosshair_items = [v_line, h_line, point_marker]
-        
-        br_str = f"{br/1000:.2f} Mbps" if br >= 1000 else f"{br:.0f} Kbps"
+        # 一次二分定位鼠标两侧的相邻点，取较近者（距离相同时取左侧），每次移动 O(log N)
+        xs = self.visible_xs
+        i = bisect.bisect_left(xs, x, lo, hi)
+        if i == hi or (i > lo and x - xs[i - 1] <= xs[i] - x):
+            i -= 1
+        
+        # 区间内的点 x 必在绘图区内，只需钳制 y
+        point_x = xs[i]
+        point_y = max(chart_top, min(chart_bottom, self.visible_ys[i]))
+        t = self.visible_times[i]
+        br = self.visible_kbps[i]
+        
+        # 十字线为常驻图元，鼠标移动时只更新坐标
+        r = self.crosshair_r
+        items = self.chart_items
+        self.canvas.coords(items['cross_v'], point_x, chart_top, point_x, chart_bottom)
+        self.canvas.coords(items['cross_h'], chart_left, point_y, chart_right, point_y)
+        self.canvas.coords(items['cross_dot'], point_x - r, point_y - r, point_x + r, point_y + r)
+        self._show_crosshair()
+        
+        br_str = self.format_bitrate(br)
         time_str = self.format_time_with_frames(t)
         self.cursor_info_label.config(text=f"⏱ {time_str}  |  📊 {br_str}")
         
@@ -2180,10 +3380,9 @@ class BitrateAnalyzer:
         if self.pending_mouse_update:
             self.root.after_cancel(self.pending_mouse_update)
             self.pending_mouse_update = None
+        self.last_mouse_xy = None
         
-        for item in self.crosshair_items:
-            self.canvas.delete(item)
-        self.crosshair_items = []
+        self._hide_crosshair()
         self.cursor_info_label.config(text="")
         
         self.hide_preview()
@@ -2210,10 +3409,25 @@ class BitrateAnalyzer:
         self.video_info_label.config(text="  |  ".join(info_parts))
     
     def update_progress(self, value, text):
-        def _update():
-            self.progress_var.set(value)
-            self.status_label.config(text=text)
-        self.root.after(0, _update)
+        """记录最新进度并按需预约一次刷新，高频调用合并为至多 20Hz 的界面更新
+        
+        被合并的只是中间进度，最后一次调用总会显示出来。
+        """
+        with self.progress_lock:
+            self.pending_progress = (value, text)
+            if self.progress_scheduled:
+                return
+            self.progress_scheduled = True
+            delay = self.last_progress_ts + self.progress_interval - time.monotonic()
+        self.root.after(max(0, int(delay * 1000)), self._flush_progress)
+    
+    def _flush_progress(self):
+        with self.progress_lock:
+            value, text = self.pending_progress
+            self.progress_scheduled = False
+            self.last_progress_ts = time.monotonic()
+        self.progress_var.set(value)
+        self.status_label.config(text=text)
 
 
 def main():